@@ -2,13 +2,42 @@
 
 __all__ = [
     "APICaller",
+    "APIKeyAuth",
     "APIRequest",
     "APIResponse",
+    "AuthError",
+    "AuthProvider",
+    "BasicAuth",
+    "BearerAuth",
+    "OAuth2ClientCredentials",
     "OpenAPIParser",
     "ParameterDef",
+    "SchemaNode",
+    "SecuritySchemeDef",
+    "ServerDef",
+    "ServerRouter",
+    "ServerVariable",
+    "ToolCatalog",
     "ToolDefinition",
 ]
 
+from .auth import (
+    APIKeyAuth,
+    AuthError,
+    AuthProvider,
+    BasicAuth,
+    BearerAuth,
+    OAuth2ClientCredentials,
+)
 from .caller import APICaller, APIRequest, APIResponse
-from .models import ParameterDef, ToolDefinition
+from .catalog import ToolCatalog
+from .models import (
+    ParameterDef,
+    SchemaNode,
+    SecuritySchemeDef,
+    ServerDef,
+    ServerVariable,
+    ToolDefinition,
+)
 from .parser import OpenAPIParser
+from .routing import ServerRouter
@@ -0,0 +1,7 @@
+"""Allow ``python -m api_client``."""
+
+import sys
+
+from api_client.cli import main
+
+sys.exit(main())
@@ -0,0 +1,251 @@
+"""Authentication providers applied to outbound requests.
+
+Providers are keyed by the name of the OpenAPI security scheme they satisfy
+and handed to APICaller. Before each request the caller picks the first of
+the operation's security requirements it has providers for and lets each
+provider add its credentials to the request.
+"""
+
+import asyncio
+import base64
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+import httpx
+
+from api_client.models import SecuritySchemeDef
+
+if TYPE_CHECKING:
+    from api_client.caller import APIRequest
+
+AUTHORIZATION_HEADER = "Authorization"
+COOKIE_HEADER = "Cookie"
+DEFAULT_TOKEN_LIFETIME_SECONDS = 3600.0
+DEFAULT_REFRESH_MARGIN_SECONDS = 60.0
+DEFAULT_TOKEN_TIMEOUT_SECONDS = 10.0
+
+
+class AuthError(Exception):
+    """Raised when credentials cannot be obtained."""
+
+
+class AuthProvider(ABC):
+    """Base class for objects that add credentials to an APIRequest."""
+
+    @abstractmethod
+    async def apply(self, request: "APIRequest", scopes: tuple[str, ...] = ()) -> None:
+        """Add credentials to the request in place.
+
+        Args:
+            request: The outbound request.
+            scopes: Scopes the operation requires from this scheme.
+        """
+
+    def invalidate(self, request: "APIRequest") -> bool:
+        """Forget credentials the server rejected for this request.
+
+        Returns:
+            True if fresh credentials may succeed and the request is worth
+            retrying; static credentials return False.
+        """
+        return False
+
+
+class APIKeyAuth(AuthProvider):
+    """Static API key sent in a header, query parameter or cookie."""
+
+    def __init__(self, key: str, name: str, location: str = "header") -> None:
+        if location not in ("header", "query", "cookie"):
+            raise ValueError(f"Unsupported API key location: {location!r}")
+        self.key = key
+        self.name = name
+        self.location = location
+
+    async def apply(self, request: "APIRequest", scopes: tuple[str, ...] = ()) -> None:
+        if self.location == "header":
+            request.headers[self.name] = self.key
+        elif self.location == "query":
+            request.query_params[self.name] = self.key
+        else:
+            cookie = f"{self.name}={self.key}"
+            existing = request.headers.get(COOKIE_HEADER)
+            request.headers[COOKIE_HEADER] = f"{existing}; {cookie}" if existing else cookie
+
+
+class BearerAuth(AuthProvider):
+    """Static bearer token for ``http`` schemes with ``scheme: bearer``."""
+
+    def __init__(self, token: str) -> None:
+        self.token = token
+
+    async def apply(self, request: "APIRequest", scopes: tuple[str, ...] = ()) -> None:
+        request.headers[AUTHORIZATION_HEADER] = f"Bearer {self.token}"
+
+
+class BasicAuth(AuthProvider):
+    """HTTP basic credentials for ``http`` schemes with ``scheme: basic``."""
+
+    def __init__(self, username: str, password: str) -> None:
+        credentials = base64.b64encode(f"{username}:{password}".encode()).decode()
+        self.header_value = f"Basic {credentials}"
+
+    async def apply(self, request: "APIRequest", scopes: tuple[str, ...] = ()) -> None:
+        request.headers[AUTHORIZATION_HEADER] = self.header_value
+
+
+@dataclass(frozen=True)
+class AccessToken:
+    """An OAuth2 access token with its expiry and refresh time on the monotonic clock."""
+
+    value: str
+    expires_at: float
+    refresh_at: float
+
+
+class OAuth2ClientCredentials(AuthProvider):
+    """OAuth2 client-credentials flow with a shared, self-refreshing token cache.
+
+    Tokens are cached per scope set. A cached token is used as-is on the hot
+    path; once it is within ``refresh_margin`` seconds of expiring (at most
+    half its lifetime, so short-lived tokens are not refreshed on every
+    call), the first request to notice starts a background refresh and keeps
+    using the still valid token. Only callers that find no valid token wait, and concurrent
+    callers share a single in-flight token request (single flight), so a
+    burst of calls or of 401s costs one round trip to the token endpoint.
+    """
+
+    def __init__(
+        self,
+        token_url: str,
+        client_id: str,
+        client_secret: str,
+        scopes: tuple[str, ...] = (),
+        refresh_margin: float = DEFAULT_REFRESH_MARGIN_SECONDS,
+        client_auth: str = "basic",
+        timeout: float = DEFAULT_TOKEN_TIMEOUT_SECONDS,
+    ) -> None:
+        if client_auth not in ("basic", "post"):
+            raise ValueError(f"Unsupported client authentication: {client_auth!r}")
+        self.token_url = token_url
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.scopes = scopes
+        self.refresh_margin = refresh_margin
+        self.client_auth = client_auth
+        self.timeout = timeout
+        self._tokens: dict[frozenset[str], AccessToken] = {}
+        self._inflight: dict[frozenset[str], asyncio.Task[AccessToken]] = {}
+
+    async def apply(self, request: "APIRequest", scopes: tuple[str, ...] = ()) -> None:
+        token = await self.get_token(scopes)
+        request.headers[AUTHORIZATION_HEADER] = f"Bearer {token.value}"
+
+    def invalidate(self, request: "APIRequest") -> bool:
+        header = request.headers.get(AUTHORIZATION_HEADER, "")
+        for key, token in list(self._tokens.items()):
+            if header == f"Bearer {token.value}":
+                del self._tokens[key]
+        return True
+
+    async def get_token(self, scopes: tuple[str, ...] = ()) -> AccessToken:
+        """Return a valid access token for the scopes, fetching one if needed.
+
+        Args:
+            scopes: Scopes required in addition to the provider's own.
+
+        Returns:
+            A cached or freshly issued AccessToken.
+
+        Raises:
+            AuthError: If the token endpoint is unreachable, refuses the
+                request or returns no token.
+        """
+        key = frozenset(self.scopes) | frozenset(scopes)
+        token = self._tokens.get(key)
+        now = time.monotonic()
+        if token is not None and now < token.expires_at:
+            if now >= token.refresh_at:
+                self._refresh(key)
+            return token
+        return await asyncio.shield(self._refresh(key))
+
+    def _refresh(self, key: frozenset[str]) -> "asyncio.Task[AccessToken]":
+        """Start a token request for a scope set unless one is in flight."""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch(key))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._refresh_done(key, done))
+        return task
+
+    def _refresh_done(self, key: frozenset[str], task: "asyncio.Task[AccessToken]") -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled() and task.exception() is None:
+            self._tokens[key] = task.result()
+
+    async def _fetch(self, key: frozenset[str]) -> AccessToken:
+        """Request a new token from the token endpoint."""
+        data: dict[str, str] = {"grant_type": "client_credentials"}
+        if key:
+            data["scope"] = " ".join(sorted(key))
+        auth: httpx.BasicAuth | None = None
+        if self.client_auth == "basic":
+            auth = httpx.BasicAuth(self.client_id, self.client_secret)
+        else:
+            data.update(client_id=self.client_id, client_secret=self.client_secret)
+        started = time.monotonic()
+        try:
+            async with httpx.AsyncClient(timeout=self.timeout, auth=auth) as client:
+                response = await client.post(self.token_url, data=data)
+        except httpx.HTTPError as exc:
+            raise AuthError(f"Token request to {self.token_url} failed: {exc}") from exc
+        if response.status_code >= 400:
+            raise AuthError(f"Token endpoint returned {response.status_code}")
+        payload: dict[str, Any] = response.json()
+        if "access_token" not in payload:
+            raise AuthError("Token endpoint response has no access_token")
+        lifetime = float(payload.get("expires_in", DEFAULT_TOKEN_LIFETIME_SECONDS))
+        expires_at = started + lifetime
+        return AccessToken(
+            value=payload["access_token"],
+            expires_at=expires_at,
+            refresh_at=expires_at - min(self.refresh_margin, lifetime / 2),
+        )
+
+    async def aclose(self) -> None:
+        """Cancel any background refresh still in flight."""
+        tasks = list(self._inflight.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def provider_for_scheme(scheme: SecuritySchemeDef, **credentials: str) -> AuthProvider:
+    """Build the provider matching a security scheme from the spec.
+
+    Args:
+        scheme: The parsed security scheme.
+        **credentials: ``key`` for API keys, ``token`` for bearer, ``username``
+            and ``password`` for basic, ``client_id`` and ``client_secret``
+            for OAuth2 client credentials.
+
+    Returns:
+        An AuthProvider for the scheme.
+
+    Raises:
+        ValueError: If the scheme type is not supported.
+    """
+    if scheme.type == "apiKey":
+        return APIKeyAuth(credentials["key"], scheme.param_name, scheme.location)
+    if scheme.type == "http" and scheme.scheme == "bearer":
+        return BearerAuth(credentials["token"])
+    if scheme.type == "http" and scheme.scheme == "basic":
+        return BasicAuth(credentials["username"], credentials["password"])
+    if scheme.type == "oauth2" and scheme.token_url:
+        return OAuth2ClientCredentials(
+            scheme.token_url, credentials["client_id"], credentials["client_secret"]
+        )
+    raise ValueError(f"Unsupported security scheme {scheme.name!r} of type {scheme.type!r}")
@@ -1,14 +1,34 @@
 """API caller that executes tool definitions against real endpoints."""
 
+import asyncio
+import time
+from collections.abc import AsyncGenerator, AsyncIterator
+from contextlib import ExitStack
 from dataclasses import dataclass, field
 from typing import Any
 
 import httpx
 
-from api_client.models import ToolDefinition
+from api_client.auth import AuthError, AuthProvider
+from api_client.encoding import (
+    JSON_CONTENT_INDICATOR,
+    JSON_CONTENT_TYPE,
+    content_kind,
+    encode_body,
+    form_value,
+    is_upload,
+    mark_uploads,
+    rewind_uploads,
+)
+from api_client.models import PaginationDef, ToolDefinition
+from api_client.pagination import extract_items, next_page, origin
+from api_client.routing import SERVER_ERROR_STATUS, ServerRouter
 
 CONTENT_TYPE_HEADER = "content-type"
-JSON_CONTENT_INDICATOR = "json"
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+DEFAULT_MAX_PAGES = 100
+REDIRECT_STATUS = 300
+UNAUTHORIZED_STATUS = 401
 
 
 @dataclass
@@ -18,8 +38,12 @@ class APIRequest:
     method: str
     url: str
     query_params: dict[str, Any] = field(default_factory=dict)
-    json_body: dict[str, Any] | None = None
+    json_body: Any = None
     headers: dict[str, str] = field(default_factory=dict)
+    content_type: str = JSON_CONTENT_TYPE
+    form_data: dict[str, Any] | None = None
+    files: dict[str, Any] | None = None
+    content: Any = None
 
 
 @dataclass
@@ -29,27 +53,117 @@ class APIResponse:
     status_code: int
     body: Any
     headers: dict[str, str] = field(default_factory=dict)
+    size: int = 0
+    url: str = ""
 
 
 class APICaller:
-    """Executes API calls built from ToolDefinition objects."""
+    """Executes API calls built from ToolDefinition objects.
 
-    def __init__(self, default_headers: dict[str, str] | None = None) -> None:
+    When a tool lists several servers, each call goes to the server the
+    router ranks best and fails over to the next one on connection errors,
+    or on transport errors and 5xx responses for idempotent methods.
+
+    ``auth`` maps security scheme names to providers. Each request is
+    authenticated with the first of the tool's security requirements that
+    is fully covered by providers; a 401 response makes the providers drop
+    the rejected credentials and the request is retried once. Without any
+    providers, requests are sent as-is, so credentials can still come from
+    ``default_headers``.
+    """
+
+    def __init__(
+        self,
+        default_headers: dict[str, str] | None = None,
+        server_variables: dict[str, str] | None = None,
+        router: ServerRouter | None = None,
+        auth: dict[str, AuthProvider] | None = None,
+    ) -> None:
         self.default_headers: dict[str, str] = default_headers or {}
+        self.server_variables: dict[str, str] = server_variables or {}
+        self.router: ServerRouter = router or ServerRouter()
+        self.auth: dict[str, AuthProvider] = auth or {}
+
+    def _auth_requirement(self, tool: ToolDefinition) -> dict[str, list[str]]:
+        """Pick the first security requirement the configured providers satisfy.
+
+        Returns:
+            Mapping of scheme name to required scopes; empty when the tool
+            needs no auth, allows anonymous access, or the caller has no
+            providers at all.
 
-    def build_request(self, tool: ToolDefinition, arguments: dict[str, Any]) -> APIRequest:
+        Raises:
+            AuthError: If providers are configured but none of the tool's
+                security requirements is fully covered by them.
+        """
+        for requirement in tool.security:
+            if all(name in self.auth for name in requirement):
+                return requirement
+        if tool.security and self.auth:
+            schemes = " or ".join("+".join(req) for req in tool.security)
+            raise AuthError(f"No auth provider configured for tool {tool.name!r}; needs {schemes}")
+        return {}
+
+    async def _authenticate(self, request: APIRequest, requirement: dict[str, list[str]]) -> None:
+        """Let the providers of a security requirement add their credentials."""
+        for name, scopes in requirement.items():
+            await self.auth[name].apply(request, tuple(scopes))
+
+    def server_urls(self, tool: ToolDefinition) -> list[str]:
+        """Resolve the tool's servers with the caller's variable overrides.
+
+        Args:
+            tool: The tool definition describing the endpoint.
+
+        Returns:
+            The concrete server URLs, or the tool's base_url if it lists none.
+        """
+        if not tool.servers:
+            return [tool.base_url]
+        return [server.resolve(self.server_variables) for server in tool.servers]
+
+    def build_request(
+        self,
+        tool: ToolDefinition,
+        arguments: dict[str, Any],
+        content_type: str | None = None,
+        base_url: str | None = None,
+    ) -> APIRequest:
         """Build an APIRequest by mapping arguments to path, query, and body params.
 
+        Body properties are collected into a JSON object unless the tool's body
+        schema is not an object with named properties (e.g. an array or a
+        map), in which case the single body argument is sent as the whole
+        payload. Nested values pass through as-is.
+
+        Form bodies are sent as fields; multipart bodies send Paths, buffers
+        and binary file objects, plus any value of a ``format: binary``
+        property, as file parts and everything else as fields. Text and
+        binary bodies take a string (sent as UTF-8 text), a Path, a bytes-like
+        buffer or a binary file object, and are streamed when the request is
+        sent. Strings are never treated as file paths.
+
         Args:
             tool: The tool definition describing the endpoint.
             arguments: Mapping of parameter names to their values.
+            content_type: Media type to encode the body as. Defaults to the
+                tool's primary content type, or JSON.
+            base_url: Server URL to target instead of the tool's base_url.
 
         Returns:
             A fully populated APIRequest ready for execution.
+
+        Raises:
+            ValueError: If an object or array body would have to be encoded as
+                a text or binary media type.
         """
         url = tool.path
         query_params: dict[str, Any] = {}
         body_params: dict[str, Any] = {}
+        whole_body_value: Any = None
+        whole_body = tool.body_schema is not None and not (
+            tool.body_schema.is_object and tool.body_schema.properties
+        )
 
         for param in tool.parameters:
             if param.name not in arguments:
@@ -59,39 +173,131 @@ class APICaller:
                 url = url.replace(f"{{{param.name}}}", str(value))
             elif param.location == "query":
                 query_params[param.name] = value
+            elif param.location == "body" and whole_body:
+                whole_body_value = value
             elif param.location == "body":
                 body_params[param.name] = value
 
-        if tool.base_url:
-            url = tool.base_url + url
+        base_url = tool.base_url if base_url is None else base_url
+        if base_url:
+            url = base_url + url
 
-        return APIRequest(
+        request = APIRequest(
             method=tool.method,
             url=url,
             query_params=query_params,
-            json_body=body_params if body_params else None,
             headers=dict(self.default_headers),
+            content_type=content_type or next(iter(tool.content_types), JSON_CONTENT_TYPE),
         )
+        body: Any = body_params if body_params else whole_body_value
+        kind = content_kind(request.content_type)
+        if kind == "json":
+            request.json_body = body
+        elif kind in ("text", "binary"):
+            if isinstance(body, (dict, list)):
+                raise ValueError(
+                    f"Tool {tool.name!r} cannot encode a structured body as "
+                    f"{request.content_type}; pass the raw body as a string, bytes, "
+                    "Path or file object"
+                )
+            request.content = body
+            if body is not None:
+                request.headers["Content-Type"] = request.content_type
+        elif isinstance(body, dict):
+            file_params = {
+                p.name
+                for p in tool.parameters
+                if p.schema is not None and p.schema.format == "binary"
+            }
+            fields = {
+                k: v
+                for k, v in body.items()
+                if kind == "form" or not (is_upload(v) or k in file_params)
+            }
+            request.form_data = {k: form_value(v) for k, v in fields.items()}
+            if kind == "multipart":
+                request.files = {k: v for k, v in body.items() if k not in fields}
+        return request
 
-    async def call(self, tool: ToolDefinition, arguments: dict[str, Any]) -> APIResponse:
+    async def call(
+        self,
+        tool: ToolDefinition,
+        arguments: dict[str, Any],
+        content_type: str | None = None,
+    ) -> APIResponse:
         """Execute an HTTP request for the given tool and return the response.
 
         Args:
             tool: The tool definition describing the endpoint.
             arguments: Mapping of parameter names to their values.
+            content_type: Media type to encode the body as, see build_request.
 
         Returns:
             An APIResponse with status code, parsed body, and headers.
         """
-        request = self.build_request(tool, arguments)
         async with httpx.AsyncClient() as client:
-            response = await client.request(
-                method=request.method,
-                url=request.url,
-                params=request.query_params,
-                json=request.json_body,
-                headers=request.headers,
-            )
+            return await self._execute(client, tool, arguments, content_type)
+
+    async def _execute(
+        self,
+        client: httpx.AsyncClient,
+        tool: ToolDefinition,
+        arguments: dict[str, Any],
+        content_type: str | None = None,
+        url: str | None = None,
+    ) -> APIResponse:
+        """Send one tool call on an open client, failing over between servers.
+
+        Caller-supplied file objects are rewound before each failover
+        attempt; a body streamed from a file object that cannot seek is sent
+        to one server only.
+
+        Args:
+            client: The HTTP client to send with.
+            tool: The tool definition describing the endpoint.
+            arguments: Mapping of parameter names to their values.
+            content_type: Media type to encode the body as, see build_request.
+            url: Absolute URL (e.g. a ``next`` link) replacing the built URL
+                and query string; disables failover.
+
+        Returns:
+            An APIResponse with status code, parsed body, headers and size.
+        """
+        urls = self.server_urls(tool)
+        candidates = self.router.rank(urls) if len(urls) > 1 and url is None else urls[:1]
+        # Link requests are only recorded against the server they point to.
+        linked = [server for server in urls if url is not None and origin(server) == origin(url)]
+        uploads = mark_uploads(arguments.values())
+        if uploads is None:
+            candidates = candidates[:1]
+        requirement = self._auth_requirement(tool)
+        for attempt, base_url in enumerate(candidates):
+            last_attempt = attempt == len(candidates) - 1
+            if attempt and uploads:
+                rewind_uploads(uploads)
+            request = self.build_request(tool, arguments, content_type, base_url)
+            if url is not None:
+                request.url, request.query_params = url, {}
+            stats_urls = [base_url] if url is None else linked[:1]
+            try:
+                response, latency = await self._send_authenticated(
+                    client, request, requirement, url, uploads
+                )
+            except httpx.TransportError as exc:
+                for server in stats_urls:
+                    self.router.record_failure(server)
+                if last_attempt or not self._can_fail_over(request.method, exc):
+                    raise
+                continue
+            if response.status_code >= SERVER_ERROR_STATUS:
+                for server in stats_urls:
+                    self.router.record_failure(server)
+                if not last_attempt and request.method in IDEMPOTENT_METHODS:
+                    continue
+            else:
+                for server in stats_urls:
+                    self.router.record_success(server, latency)
+            break
         content_type = response.headers.get(CONTENT_TYPE_HEADER, "")
         if JSON_CONTENT_INDICATOR in content_type:
             body: Any = response.json()
@@ -101,4 +307,255 @@ class APICaller:
             status_code=response.status_code,
             body=body,
             headers=dict(response.headers),
+            size=len(response.content),
+            url=str(response.url),
+        )
+
+    async def _walk_pages(
+        self,
+        tool: ToolDefinition,
+        arguments: dict[str, Any],
+        pagination: PaginationDef | None,
+        max_items: int | None,
+        max_bytes: int | None,
+        max_pages: int,
+    ) -> AsyncGenerator[tuple[APIResponse, bool], None]:
+        """Yield each page with whether the endpoint has more pages after it.
+
+        The request for the next page is started before the current page is
+        yielded, unless a budget is exhausted. Next-page URLs are only
+        followed when they share the origin of the current page or of one of
+        the tool's servers, so credentials are never sent to another host;
+        walking stops at a foreign link, and the page reports more pages.
+        """
+        if max_pages < 1:
+            raise ValueError(f"max_pages must be at least 1, got {max_pages}")
+        pagination = pagination or tool.pagination
+        item_total = byte_total = 0
+        seen_urls: set[str] = set()
+        trusted = {origin(server) for server in self.server_urls(tool)}
+        async with httpx.AsyncClient() as client:
+            pending = asyncio.ensure_future(self._execute(client, tool, arguments))
+            try:
+                for page_number in range(1, max_pages + 1):
+                    page = await pending
+                    following = None
+                    if pagination is not None and page.status_code < REDIRECT_STATUS:
+                        items = extract_items(page.body, pagination)
+                        item_total += len(items)
+                        following = next_page(
+                            pagination, arguments, page.body, page.headers, len(items), page.url
+                        )
+                    byte_total += page.size
+                    if following is not None and following[1] in seen_urls:
+                        following = None
+                    foreign = (
+                        following is not None
+                        and following[1] is not None
+                        and origin(following[1]) not in {*trusted, origin(page.url)}
+                    )
+                    within_budget = (
+                        not foreign
+                        and page_number < max_pages
+                        and (max_items is None or item_total < max_items)
+                        and (max_bytes is None or byte_total < max_bytes)
+                    )
+                    if following is not None and within_budget:
+                        arguments, url = following
+                        if url is not None:
+                            seen_urls.add(url)
+                        pending = asyncio.ensure_future(
+                            self._execute(client, tool, arguments, url=url)
+                        )
+                    yield page, following is not None
+                    if following is None or not within_budget:
+                        break
+            finally:
+                if not pending.done():
+                    pending.cancel()
+                    await asyncio.gather(pending, return_exceptions=True)
+
+    async def _send_authenticated(
+        self,
+        client: httpx.AsyncClient,
+        request: APIRequest,
+        requirement: dict[str, list[str]],
+        url: str | None,
+        uploads: list[tuple[Any, int]] | None,
+    ) -> tuple[httpx.Response, float]:
+        """Authenticate and send a request, retrying once after a 401.
+
+        The retry only happens when a provider dropped the rejected
+        credentials, so static keys are not resent pointlessly. File objects
+        in ``uploads`` are rewound before the retry; when ``uploads`` is None
+        the body cannot be rewound and the 401 is returned as-is.
+
+        Returns:
+            The response and the seconds spent sending the request that
+            produced it, excluding token fetches and a rejected first attempt.
+        """
+        query_params = dict(request.query_params)
+        headers = dict(request.headers)
+        await self._authenticate(request, requirement)
+        start = time.perf_counter()
+        response = await self._send(client, request, merge_query=url is not None)
+        latency = time.perf_counter() - start
+        if response.status_code != UNAUTHORIZED_STATUS or not requirement or uploads is None:
+            return response, latency
+        invalidated = [self.auth[name].invalidate(request) for name in requirement]
+        if not any(invalidated):
+            return response, latency
+        rewind_uploads(uploads)
+        request.query_params, request.headers = query_params, headers
+        await self._authenticate(request, requirement)
+        start = time.perf_counter()
+        response = await self._send(client, request, merge_query=url is not None)
+        return response, time.perf_counter() - start
+
+    @staticmethod
+    async def _send(
+        client: httpx.AsyncClient, request: APIRequest, merge_query: bool = False
+    ) -> httpx.Response:
+        """Encode and send an APIRequest.
+
+        Args:
+            client: The HTTP client to send with.
+            request: The request to send.
+            merge_query: Merge query_params into the query string already in
+                the URL (e.g. of a ``next`` link) instead of replacing it.
+
+        Returns:
+            The raw httpx response.
+        """
+        url: str | httpx.URL = request.url
+        params: dict[str, Any] | None = request.query_params
+        if merge_query:
+            url, params = httpx.URL(request.url).copy_merge_params(request.query_params), None
+        with ExitStack() as stack:
+            body_kwargs, body_headers = encode_body(request, stack)
+            return await client.request(
+                method=request.method,
+                url=url,
+                params=params,
+                headers={**request.headers, **body_headers},
+                **body_kwargs,
+            )
+
+    async def iter_pages(
+        self,
+        tool: ToolDefinition,
+        arguments: dict[str, Any],
+        pagination: PaginationDef | None = None,
+        max_items: int | None = None,
+        max_bytes: int | None = None,
+        max_pages: int = DEFAULT_MAX_PAGES,
+    ) -> AsyncIterator[APIResponse]:
+        """Walk a paginated endpoint, yielding one APIResponse per page.
+
+        As soon as a page arrives, the request for the following page is
+        started in the background, so it downloads while the caller consumes
+        the current one. Iteration stops at the last page, after a non-2xx
+        response (which is still yielded), or once a budget is reached.
+
+        Args:
+            tool: The tool definition describing the endpoint.
+            arguments: Arguments for the first page.
+            pagination: Overrides the tool's detected pagination.
+            max_items: Stop after pages totalling at least this many items.
+            max_bytes: Stop after pages totalling at least this many body bytes.
+            max_pages: Upper bound on the number of pages fetched.
+
+        Yields:
+            The APIResponse of each page, in order.
+
+        Raises:
+            ValueError: If ``max_pages`` is less than 1.
+        """
+        pages = self._walk_pages(tool, arguments, pagination, max_items, max_bytes, max_pages)
+        try:
+            async for page, _ in pages:
+                yield page
+        finally:
+            await pages.aclose()
+
+    async def paginate(
+        self,
+        tool: ToolDefinition,
+        arguments: dict[str, Any],
+        pagination: PaginationDef | None = None,
+        max_items: int | None = None,
+        max_bytes: int | None = None,
+        max_pages: int = DEFAULT_MAX_PAGES,
+    ) -> APIResponse:
+        """Collect the pages of a paginated endpoint into a single response.
+
+        Args:
+            tool: The tool definition describing the endpoint.
+            arguments: Arguments for the first page.
+            pagination: Overrides the tool's detected pagination.
+            max_items: Cap on the number of items collected.
+            max_bytes: Stop after pages totalling at least this many body bytes.
+            max_pages: Upper bound on the number of pages fetched.
+
+        Returns:
+            An APIResponse whose body holds the collected ``items``, the
+            ``page_count`` and whether the listing is ``complete``. Status and
+            headers come from the last page fetched.
+
+        Raises:
+            ValueError: If neither the tool nor ``pagination`` describes paging,
+                or ``max_pages`` is less than 1.
+        """
+        pagination = pagination or tool.pagination
+        if pagination is None:
+            raise ValueError(f"Tool {tool.name!r} has no pagination configured")
+        if max_pages < 1:
+            raise ValueError(f"max_pages must be at least 1, got {max_pages}")
+        items: list[Any] = []
+        size = page_count = 0
+        complete = False
+        pages = self._walk_pages(tool, arguments, pagination, max_items, max_bytes, max_pages)
+        try:
+            async for page, has_more in pages:
+                last = page
+                page_count += 1
+                size += page.size
+                if page.status_code >= REDIRECT_STATUS:
+                    break
+                items.extend(extract_items(page.body, pagination))
+                complete = not has_more
+        finally:
+            await pages.aclose()
+        if max_items is not None and len(items) > max_items:
+            del items[max_items:]
+            complete = False
+        return APIResponse(
+            status_code=last.status_code,
+            body={"items": items, "page_count": page_count, "complete": complete},
+            headers=last.headers,
+            size=size,
         )
+
+    @staticmethod
+    def _can_fail_over(method: str, exc: httpx.TransportError) -> bool:
+        """Whether a failed attempt may be retried on another server.
+
+        Connection failures never reached the server, so any method may be
+        retried; other transport errors only for idempotent methods.
+        """
+        if isinstance(exc, (httpx.ConnectError, httpx.ConnectTimeout)):
+            return True
+        return method in IDEMPOTENT_METHODS
+
+    async def check_servers(self, tool: ToolDefinition, path: str = "") -> dict[str, bool]:
+        """Probe every server of a tool and update the router's health state.
+
+        Args:
+            tool: The tool whose servers should be probed.
+            path: Health endpoint appended to each server URL.
+
+        Returns:
+            Mapping of server URL to whether its probe succeeded.
+        """
+        async with httpx.AsyncClient() as client:
+            return await self.router.check_health(client, self.server_urls(tool), path)
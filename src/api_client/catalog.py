@@ -0,0 +1,416 @@
+"""Read-only, memory-mapped tool catalog shared between worker processes.
+
+A catalog file holds the parsed ToolDefinitions and their OpenAI export in a
+compact binary layout::
+
+    header | records ... | tool index | schema index
+
+Tool and schema records are compact JSON blobs. Both indexes are fixed-width
+tables, and the tool index is sorted by name, so a lookup is a binary search
+over the mapped file. Opening a catalog therefore reads nothing but the
+header, and every process mapping the same file shares its physical pages.
+ToolDefinition and SchemaNode objects are only built when looked up, and a
+schema shared by several tools is stored once and rebuilt once.
+"""
+
+import json
+import mmap
+import os
+import struct
+import tempfile
+from collections.abc import Iterator
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Self
+
+from api_client.models import (
+    PaginationDef,
+    ParameterDef,
+    SchemaNode,
+    ServerDef,
+    ServerVariable,
+    ToolDefinition,
+    intern_schema,
+)
+
+CATALOG_MAGIC = b"APICAT\x00\x01"
+CATALOG_VERSION = 1
+NO_SCHEMA = -1
+CATALOG_FILE_MODE = 0o644
+
+# magic, version, tool count, schema count, tool index offset, schema index offset
+_HEADER = struct.Struct("<8sIIIQQ")
+# name offset, name length, tool offset, tool length, openai offset, openai length
+_TOOL_ENTRY = struct.Struct("<QIQIQI")
+# schema offset, schema length
+_SCHEMA_ENTRY = struct.Struct("<QI")
+
+
+def _dumps(obj: Any) -> bytes:
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+class _SchemaTable:
+    """Assigns one index per distinct schema node while writing a catalog."""
+
+    def __init__(self) -> None:
+        self.records: list[bytes] = []
+        self._index: dict[Any, int] = {}
+
+    def add(self, node: SchemaNode | None) -> int:
+        if node is None:
+            return NO_SCHEMA
+        try:
+            key: Any = node
+            hash(key)
+        except TypeError:
+            key = id(node)
+        index = self._index.get(key)
+        if index is not None:
+            return index
+        record: dict[str, Any] = {}
+        if node.type:
+            record["t"] = node.type
+        if node.description:
+            record["d"] = node.description
+        if node.format:
+            record["f"] = node.format
+        if node.properties:
+            record["p"] = [[name, self.add(sub)] for name, sub in node.properties]
+        if node.required:
+            record["r"] = list(node.required)
+        if node.items is not None:
+            record["i"] = self.add(node.items)
+        if node.enum:
+            record["e"] = list(node.enum)
+        if node.one_of:
+            record["o"] = [self.add(sub) for sub in node.one_of]
+        if node.any_of:
+            record["y"] = [self.add(sub) for sub in node.any_of]
+        if node.all_of:
+            record["a"] = [self.add(sub) for sub in node.all_of]
+        if node.nullable:
+            record["n"] = True
+        if isinstance(node.additional_properties, SchemaNode):
+            record["x"] = self.add(node.additional_properties)
+        elif node.additional_properties is not None:
+            record["x"] = node.additional_properties
+        index = self._index[key] = len(self.records)
+        self.records.append(_dumps(record))
+        return index
+
+
+def _server_record(server: ServerDef) -> dict[str, Any]:
+    record: dict[str, Any] = {"url": server.url}
+    if server.description:
+        record["description"] = server.description
+    if server.variables:
+        record["variables"] = {
+            name: [variable.default, list(variable.enum), variable.description]
+            for name, variable in server.variables
+        }
+    return record
+
+
+def write_catalog(
+    path: str | os.PathLike[str],
+    tools: list[ToolDefinition],
+    openai_tools: list[dict[str, Any]],
+) -> None:
+    """Write tools and their OpenAI export to a catalog file.
+
+    The file is written next to ``path`` and atomically renamed into place,
+    so processes that already mapped the previous catalog keep a consistent
+    view until they reopen it.
+
+    Args:
+        path: Destination of the catalog file.
+        tools: Parsed tool definitions.
+        openai_tools: OpenAI function-calling dicts, parallel to ``tools``.
+
+    Raises:
+        ValueError: If ``tools`` and ``openai_tools`` differ in length.
+    """
+    if len(tools) != len(openai_tools):
+        raise ValueError("tools and openai_tools must have the same length")
+    schemas = _SchemaTable()
+    entries: list[tuple[bytes, bytes, bytes]] = []
+    for tool, openai_tool in zip(tools, openai_tools, strict=True):
+        record = {
+            "description": tool.description,
+            "method": tool.method,
+            "path": tool.path,
+            "base_url": tool.base_url,
+            "parameters": [
+                [p.name, p.type, p.required, p.location, p.description, schemas.add(p.schema)]
+                for p in tool.parameters
+            ],
+            "body_schema": schemas.add(tool.body_schema),
+            "content_types": tool.content_types,
+            "servers": [_server_record(server) for server in tool.servers],
+            "pagination": asdict(tool.pagination) if tool.pagination is not None else None,
+            "security": tool.security,
+        }
+        entries.append((tool.name.encode(), _dumps(record), _dumps(openai_tool)))
+    entries.sort(key=lambda entry: entry[0])
+
+    body = bytearray()
+    tool_index = bytearray()
+    for name, tool_record, openai_record in entries:
+        offsets: list[int] = []
+        for blob in (name, tool_record, openai_record):
+            offsets.extend((_HEADER.size + len(body), len(blob)))
+            body += blob
+        tool_index += _TOOL_ENTRY.pack(*offsets)
+    schema_index = bytearray()
+    for schema_record in schemas.records:
+        schema_index += _SCHEMA_ENTRY.pack(_HEADER.size + len(body), len(schema_record))
+        body += schema_record
+
+    tool_index_offset = _HEADER.size + len(body)
+    header = _HEADER.pack(
+        CATALOG_MAGIC,
+        CATALOG_VERSION,
+        len(entries),
+        len(schemas.records),
+        tool_index_offset,
+        tool_index_offset + len(tool_index),
+    )
+    target = Path(path)
+    fd, tmp_name = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(header)
+            handle.write(body)
+            handle.write(tool_index)
+            handle.write(schema_index)
+        os.chmod(tmp_name, CATALOG_FILE_MODE)
+        os.replace(tmp_name, target)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+
+
+class ToolCatalog:
+    """Lazy, read-only view over a memory-mapped catalog file.
+
+    Use ``ToolCatalog.open(path)``; the catalog is also a context manager
+    that unmaps the file on exit.
+    """
+
+    def __init__(self, buffer: mmap.mmap) -> None:
+        self._buffer = buffer
+        if len(buffer) < _HEADER.size:
+            raise ValueError("Not a tool catalog file or unsupported catalog version")
+        magic, version, tool_count, schema_count, tool_index, schema_index = _HEADER.unpack_from(
+            buffer, 0
+        )
+        if magic != CATALOG_MAGIC or version != CATALOG_VERSION:
+            raise ValueError("Not a tool catalog file or unsupported catalog version")
+        self._tool_count: int = tool_count
+        self._schema_count: int = schema_count
+        self._tool_index: int = tool_index
+        self._schema_index: int = schema_index
+        self._tools: dict[str, ToolDefinition] = {}
+        self._schemas: dict[int, SchemaNode] = {}
+
+    @classmethod
+    def open(cls, path: str | os.PathLike[str]) -> Self:
+        """Map a catalog file read-only.
+
+        Args:
+            path: Location of a file produced by ``write_catalog``.
+
+        Returns:
+            A ToolCatalog backed by the mapped file.
+
+        Raises:
+            ValueError: If the file is not a catalog of a supported version.
+        """
+        with open(path, "rb") as handle:
+            buffer = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            return cls(buffer)
+        except BaseException:
+            buffer.close()
+            raise
+
+    def close(self) -> None:
+        """Unmap the catalog file."""
+        self._buffer.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._tool_count
+
+    def __contains__(self, name: object) -> bool:
+        return isinstance(name, str) and self._find(name) is not None
+
+    def __getitem__(self, name: str) -> ToolDefinition:
+        tool = self.get(name)
+        if tool is None:
+            raise KeyError(name)
+        return tool
+
+    def __iter__(self) -> Iterator[ToolDefinition]:
+        for name in self.names():
+            yield self[name]
+
+    def _entry(self, position: int) -> tuple[int, int, int, int, int, int]:
+        return _TOOL_ENTRY.unpack_from(self._buffer, self._tool_index + position * _TOOL_ENTRY.size)
+
+    def _name_at(self, position: int) -> bytes:
+        name_offset, name_length, *_ = self._entry(position)
+        return self._buffer[name_offset : name_offset + name_length]
+
+    def _find(self, name: str) -> int | None:
+        """Binary search the sorted tool index for a name."""
+        key = name.encode()
+        low, high = 0, self._tool_count
+        while low < high:
+            middle = (low + high) // 2
+            if self._name_at(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self._tool_count and self._name_at(low) == key:
+            return low
+        return None
+
+    def _load_json(self, offset: int, length: int) -> Any:
+        return json.loads(self._buffer[offset : offset + length])
+
+    def names(self) -> Iterator[str]:
+        """Iterate over tool names in sorted order without building tools."""
+        for position in range(self._tool_count):
+            yield self._name_at(position).decode()
+
+    def get(self, name: str) -> ToolDefinition | None:
+        """Build (once) and return the ToolDefinition for a name.
+
+        Args:
+            name: The tool name.
+
+        Returns:
+            The ToolDefinition, or None if the catalog has no such tool.
+        """
+        tool = self._tools.get(name)
+        if tool is not None:
+            return tool
+        position = self._find(name)
+        if position is None:
+            return None
+        _, _, tool_offset, tool_length, _, _ = self._entry(position)
+        record = self._load_json(tool_offset, tool_length)
+        tool = ToolDefinition(
+            name=name,
+            description=record["description"],
+            method=record["method"],
+            path=record["path"],
+            parameters=[
+                ParameterDef(
+                    name=p_name,
+                    type=p_type,
+                    required=required,
+                    location=location,
+                    description=description,
+                    schema=self._schema(schema_index),
+                )
+                for p_name, p_type, required, location, description, schema_index in record[
+                    "parameters"
+                ]
+            ],
+            base_url=record["base_url"],
+            body_schema=self._schema(record["body_schema"]),
+            content_types=record["content_types"],
+            servers=[
+                ServerDef(
+                    url=server["url"],
+                    description=server.get("description", ""),
+                    variables=tuple(
+                        (var_name, ServerVariable(default, tuple(enum), var_description))
+                        for var_name, (default, enum, var_description) in server.get(
+                            "variables", {}
+                        ).items()
+                    ),
+                )
+                for server in record["servers"]
+            ],
+            pagination=PaginationDef(**record["pagination"]) if record.get("pagination") else None,
+            security=record.get("security", []),
+        )
+        self._tools[name] = tool
+        return tool
+
+    def _schema(self, index: int) -> SchemaNode | None:
+        """Return the schema node at an index of the schema table, or None for NO_SCHEMA."""
+        if index == NO_SCHEMA:
+            return None
+        return self._schema_at(index)
+
+    def _schema_at(self, index: int) -> SchemaNode:
+        """Build (once) the schema node stored at an index known to be present."""
+        node = self._schemas.get(index)
+        if node is not None:
+            return node
+        offset, length = _SCHEMA_ENTRY.unpack_from(
+            self._buffer, self._schema_index + index * _SCHEMA_ENTRY.size
+        )
+        record = self._load_json(offset, length)
+        additional = record.get("x")
+        node = intern_schema(
+            SchemaNode(
+                type=record.get("t", ""),
+                description=record.get("d", ""),
+                format=record.get("f", ""),
+                properties=tuple((name, self._schema_at(sub)) for name, sub in record.get("p", ())),
+                required=tuple(record.get("r", ())),
+                items=self._schema(record.get("i", NO_SCHEMA)),
+                enum=tuple(record.get("e", ())),
+                one_of=tuple(self._schema_at(sub) for sub in record.get("o", ())),
+                any_of=tuple(self._schema_at(sub) for sub in record.get("y", ())),
+                all_of=tuple(self._schema_at(sub) for sub in record.get("a", ())),
+                nullable=record.get("n", False),
+                additional_properties=(
+                    additional
+                    if isinstance(additional, bool | None)
+                    else self._schema_at(additional)
+                ),
+            )
+        )
+        self._schemas[index] = node
+        return node
+
+    def openai_tool_bytes(self, name: str) -> memoryview | None:
+        """Return the stored OpenAI export of a tool as JSON bytes, without copying.
+
+        The view must be released before the catalog is closed.
+
+        Args:
+            name: The tool name.
+
+        Returns:
+            A read-only view into the mapped file, or None for unknown tools.
+        """
+        position = self._find(name)
+        if position is None:
+            return None
+        *_, offset, length = self._entry(position)
+        return memoryview(self._buffer)[offset : offset + length]
+
+    def openai_tool(self, name: str) -> dict[str, Any] | None:
+        """Decode the stored OpenAI function-calling dict of a tool."""
+        raw = self.openai_tool_bytes(name)
+        if raw is None:
+            return None
+        with raw:
+            return json.loads(bytes(raw))
+
+    def openai_tools(self) -> list[dict[str, Any]]:
+        """Decode the OpenAI export of every tool, in name order."""
+        return [self._load_json(*self._entry(position)[4:]) for position in range(len(self))]
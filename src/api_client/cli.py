@@ -0,0 +1,303 @@
+"""Command-line entry point: compile, inspect and benchmark API tool catalogs.
+
+Usage::
+
+    api-client compile SPEC -o CATALOG [--openai-out TOOLS_JSON]
+    api-client inspect SPEC_OR_CATALOG [--json]
+    api-client bench SPEC_OR_CATALOG TOOL [-n N] [-c C] [--base-url URL] [--args JSON]
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any
+
+from api_client.caller import APICaller
+from api_client.catalog import CATALOG_MAGIC, ToolCatalog
+from api_client.models import ToolDefinition
+from api_client.parser import OpenAPIParser
+
+YAML_SUFFIXES = (".yaml", ".yml")
+PERCENTILES = (50, 90, 99)
+DEFAULT_BENCH_REQUESTS = 100
+DEFAULT_BENCH_CONCURRENCY = 10
+CLIENT_ERROR_STATUS = 400
+
+
+def load_spec(path: Path) -> dict[str, Any]:
+    """Load an OpenAPI spec from a JSON or (with PyYAML installed) YAML file.
+
+    Raises:
+        ValueError: If a YAML spec is given but PyYAML is not installed.
+    """
+    text = path.read_text(encoding="utf-8")
+    if path.suffix.lower() in YAML_SUFFIXES:
+        try:
+            import yaml  # type: ignore[import-untyped]
+        except ImportError as exc:
+            raise ValueError("Reading YAML specs requires PyYAML (pip install pyyaml)") from exc
+        return yaml.safe_load(text)
+    return json.loads(text)
+
+
+def is_catalog(path: Path) -> bool:
+    """Whether a file starts with the catalog magic bytes."""
+    with path.open("rb") as handle:
+        return handle.read(len(CATALOG_MAGIC)) == CATALOG_MAGIC
+
+
+def load_tools(path: Path) -> tuple[list[ToolDefinition], dict[str, float]]:
+    """Load every tool from a catalog or spec file, timing each phase.
+
+    Returns:
+        The tools and a mapping of phase name to elapsed milliseconds.
+    """
+    timings: dict[str, float] = {}
+    start = time.perf_counter()
+    if is_catalog(path):
+        with ToolCatalog.open(path) as catalog:
+            timings["open_ms"] = (time.perf_counter() - start) * 1000
+            start = time.perf_counter()
+            tools = list(catalog)
+            timings["materialize_ms"] = (time.perf_counter() - start) * 1000
+        return tools, timings
+    spec = load_spec(path)
+    timings["load_ms"] = (time.perf_counter() - start) * 1000
+    parser = OpenAPIParser(spec)
+    start = time.perf_counter()
+    tools = parser.parse()
+    timings["parse_ms"] = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    parser.to_openai_tools(tools)
+    timings["openai_export_ms"] = (time.perf_counter() - start) * 1000
+    return tools, timings
+
+
+def load_tool(path: Path, name: str) -> ToolDefinition | None:
+    """Load a single tool by name, using the catalog's lazy lookup when possible."""
+    if is_catalog(path):
+        with ToolCatalog.open(path) as catalog:
+            return catalog.get(name)
+    return next(
+        (tool for tool in OpenAPIParser(load_spec(path)).parse() if tool.name == name), None
+    )
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an ascending list (0.0 when empty)."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, round(pct / 100 * len(sorted_values) + 0.5 - 1e-9))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def tool_stats(tools: list[ToolDefinition]) -> dict[str, Any]:
+    """Summarize tool and parameter counts for ``inspect``."""
+    param_counts = [len(tool.parameters) for tool in tools]
+    return {
+        "tools": len(tools),
+        "methods": dict(Counter(tool.method for tool in tools)),
+        "parameters": {
+            "total": sum(param_counts),
+            "required": sum(p.required for tool in tools for p in tool.parameters),
+            "by_location": dict(Counter(p.location for tool in tools for p in tool.parameters)),
+            "mean_per_tool": round(sum(param_counts) / len(tools), 2) if tools else 0.0,
+            "max_per_tool": max(param_counts, default=0),
+        },
+        "content_types": dict(Counter(ct for tool in tools for ct in tool.content_types)),
+        "paginated": sum(tool.pagination is not None for tool in tools),
+        "secured": sum(bool(tool.security) for tool in tools),
+        "multi_server": sum(len(tool.servers) > 1 for tool in tools),
+    }
+
+
+def cmd_compile(args: argparse.Namespace) -> int:
+    spec = load_spec(args.spec)
+    parser = OpenAPIParser(spec)
+    start = time.perf_counter()
+    tools = parser.export_catalog(args.output)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    if args.openai_out is not None:
+        args.openai_out.write_text(json.dumps(parser.to_openai_tools(tools), indent=2) + "\n")
+    print(f"Compiled {len(tools)} tools to {args.output} in {elapsed_ms:.1f} ms")
+    return 0
+
+
+def cmd_inspect(args: argparse.Namespace) -> int:
+    tools, timings = load_tools(args.path)
+    report = {**tool_stats(tools), "timings_ms": {k: round(v, 3) for k, v in timings.items()}}
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+    params = report["parameters"]
+    print(f"Tools:          {report['tools']}")
+    print(f"Methods:        {_format_counts(report['methods'])}")
+    print(
+        f"Parameters:     {params['total']} total, {params['required']} required, "
+        f"{params['mean_per_tool']} mean / {params['max_per_tool']} max per tool"
+    )
+    print(f"By location:    {_format_counts(params['by_location'])}")
+    print(f"Content types:  {_format_counts(report['content_types'])}")
+    print(f"Paginated:      {report['paginated']}")
+    print(f"Secured:        {report['secured']}")
+    print(f"Multi-server:   {report['multi_server']}")
+    print(f"Timings:        {_format_counts(report['timings_ms'], ' ms')}")
+    return 0
+
+
+async def run_bench(
+    caller: APICaller,
+    tool: ToolDefinition,
+    arguments: dict[str, Any],
+    requests: int,
+    concurrency: int,
+) -> dict[str, Any]:
+    """Fire ``requests`` calls with at most ``concurrency`` in flight.
+
+    Returns:
+        Throughput of all calls and of successful (non-raising, non-4xx/5xx)
+        calls, latency percentiles in milliseconds of calls that got a
+        response, status code counts and the number of calls that raised.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    statuses: Counter[int] = Counter()
+    errors: Counter[str] = Counter()
+
+    async def one() -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                response = await caller.call(tool, arguments)
+            except Exception as exc:  # noqa: BLE001 - every failure is a data point
+                errors[type(exc).__name__] += 1
+                return
+            latencies.append((time.perf_counter() - start) * 1000)
+            statuses[response.status_code] += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    successes = sum(count for status, count in statuses.items() if status < CLIENT_ERROR_STATUS)
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "elapsed_s": round(elapsed, 3),
+        "successes": successes,
+        "throughput_rps": round(requests / elapsed, 1) if elapsed else 0.0,
+        "success_rps": round(successes / elapsed, 1) if elapsed else 0.0,
+        "latency_ms": {
+            **{f"p{pct}": round(percentile(latencies, pct), 3) for pct in PERCENTILES},
+            "max": round(latencies[-1], 3) if latencies else 0.0,
+        },
+        "status_codes": dict(sorted(statuses.items())),
+        "errors": dict(errors),
+    }
+
+
+def cmd_bench(args: argparse.Namespace) -> int:
+    tool = load_tool(args.path, args.tool)
+    if tool is None:
+        print(f"error: no tool named {args.tool!r}", file=sys.stderr)
+        return 1
+    if args.base_url is not None:
+        tool.base_url, tool.servers = args.base_url.rstrip("/"), []
+    caller = APICaller(default_headers=dict(args.header))
+    report = asyncio.run(run_bench(caller, tool, args.args, args.requests, args.concurrency))
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+    latency = report["latency_ms"]
+    print(f"Requests:     {report['requests']} (concurrency {report['concurrency']})")
+    print(f"Elapsed:      {report['elapsed_s']} s")
+    print(f"Throughput:   {report['throughput_rps']} req/s ({report['success_rps']} successful)")
+    print(f"Latency (ms): {_format_counts(latency)}")
+    print(f"Status codes: {_format_counts(report['status_codes'])}")
+    if report["errors"]:
+        print(f"Errors:       {_format_counts(report['errors'])}")
+    return 0
+
+
+def _format_counts(counts: dict[Any, Any], suffix: str = "") -> str:
+    return ", ".join(f"{key}={value}{suffix}" for key, value in counts.items()) or "-"
+
+
+def _positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError("must be at least 1")
+    return number
+
+
+def _json_object(value: str) -> dict[str, Any]:
+    try:
+        parsed = json.loads(value)
+    except json.JSONDecodeError as exc:
+        raise argparse.ArgumentTypeError(f"invalid JSON: {exc}") from exc
+    if not isinstance(parsed, dict):
+        raise argparse.ArgumentTypeError(f"expected a JSON object, got {value!r}")
+    return parsed
+
+
+def _header(value: str) -> tuple[str, str]:
+    name, separator, header_value = value.partition(":")
+    if not separator or not name.strip():
+        raise argparse.ArgumentTypeError(f"expected 'Name: value', got {value!r}")
+    return name.strip(), header_value.strip()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser for all subcommands."""
+    parser = argparse.ArgumentParser(
+        prog="api-client", description="Compile, inspect and benchmark OpenAPI tool catalogs."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    compile_cmd = commands.add_parser("compile", help="parse a spec into a tool catalog")
+    compile_cmd.add_argument("spec", type=Path, help="OpenAPI spec (JSON, or YAML with PyYAML)")
+    compile_cmd.add_argument("-o", "--output", type=Path, required=True, help="catalog file")
+    compile_cmd.add_argument("--openai-out", type=Path, help="also write OpenAI tools JSON here")
+    compile_cmd.set_defaults(handler=cmd_compile)
+
+    inspect_cmd = commands.add_parser("inspect", help="show tool and parameter statistics")
+    inspect_cmd.add_argument("path", type=Path, help="OpenAPI spec or compiled catalog")
+    inspect_cmd.add_argument("--json", action="store_true", help="print a JSON report")
+    inspect_cmd.set_defaults(handler=cmd_inspect)
+
+    bench_cmd = commands.add_parser("bench", help="load test one tool through APICaller")
+    bench_cmd.add_argument("path", type=Path, help="OpenAPI spec or compiled catalog")
+    bench_cmd.add_argument("tool", help="name of the tool to call")
+    bench_cmd.add_argument("-n", "--requests", type=_positive_int, default=DEFAULT_BENCH_REQUESTS)
+    bench_cmd.add_argument(
+        "-c", "--concurrency", type=_positive_int, default=DEFAULT_BENCH_CONCURRENCY
+    )
+    bench_cmd.add_argument("--base-url", help="target server, overriding the spec's servers")
+    bench_cmd.add_argument(
+        "--args", type=_json_object, default="{}", help="tool arguments as a JSON object"
+    )
+    bench_cmd.add_argument(
+        "-H",
+        "--header",
+        type=_header,
+        action="append",
+        default=[],
+        help="extra header 'Name: value'",
+    )
+    bench_cmd.add_argument("--json", action="store_true", help="print a JSON report")
+    bench_cmd.set_defaults(handler=cmd_bench)
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the CLI and return its exit status."""
+    args = build_parser().parse_args(argv)
+    try:
+        return args.handler(args)
+    except (OSError, ValueError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
@@ -0,0 +1,225 @@
+"""Request body encoders for the content types an operation accepts."""
+
+import json
+import os
+from collections.abc import AsyncIterator, Iterable
+from contextlib import ExitStack
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from api_client.caller import APIRequest
+
+JSON_CONTENT_TYPE = "application/json"
+FORM_CONTENT_TYPE = "application/x-www-form-urlencoded"
+MULTIPART_CONTENT_TYPE = "multipart/form-data"
+BINARY_CONTENT_TYPE = "application/octet-stream"
+TEXT_CONTENT_TYPE = "text/plain"
+JSON_CONTENT_INDICATOR = "json"
+XML_CONTENT_INDICATOR = "xml"
+TEXT_ENCODING = "utf-8"
+CHUNK_SIZE = 64 * 1024
+
+BufferTypes = (bytes, bytearray, memoryview)
+
+
+def content_kind(content_type: str) -> str:
+    """Classify a media type into the encoder family that handles it.
+
+    Args:
+        content_type: A media type such as ``application/json``.
+
+    Returns:
+        One of ``"json"``, ``"form"``, ``"multipart"``, ``"text"`` (``text/*``
+        and XML) or ``"binary"``.
+    """
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    if not media_type or JSON_CONTENT_INDICATOR in media_type:
+        return "json"
+    if media_type == FORM_CONTENT_TYPE:
+        return "form"
+    if media_type.startswith("multipart/"):
+        return "multipart"
+    if media_type.startswith("text/") or XML_CONTENT_INDICATOR in media_type:
+        return "text"
+    return "binary"
+
+
+def is_upload(value: Any) -> bool:
+    """Whether a value should be streamed as file content rather than a form field.
+
+    Plain strings are never uploads: they come from tool-call arguments, and
+    treating them as paths would let a model read local files.
+    """
+    return isinstance(value, (*BufferTypes, Path)) or hasattr(value, "read")
+
+
+def form_value(value: Any) -> Any:
+    """Render a non-file form field.
+
+    Lists of scalars pass through, so they are sent as repeated keys
+    (``tags=a&tags=b``, the OpenAPI ``style: form, explode: true`` default).
+    Objects, and lists holding objects or lists, are sent as JSON text.
+    """
+    if isinstance(value, dict):
+        return json.dumps(value)
+    if isinstance(value, list) and any(isinstance(item, (dict, list)) for item in value):
+        return json.dumps(value)
+    return value
+
+
+class BufferReader:
+    """Read-only file-like view over a bytes-like buffer.
+
+    ``read`` hands out ``memoryview`` slices of the underlying buffer, so
+    multipart uploads from in-memory buffers are streamed without copying.
+    """
+
+    def __init__(self, buffer: bytes | bytearray | memoryview, name: str = "upload") -> None:
+        self._view = memoryview(buffer).cast("B")
+        self._offset = 0
+        self.name = name
+
+    def read(self, size: int = -1) -> memoryview:
+        end = len(self._view) if size < 0 else min(self._offset + size, len(self._view))
+        chunk = self._view[self._offset : end]
+        self._offset = end
+        return chunk
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        base = {os.SEEK_SET: 0, os.SEEK_CUR: self._offset, os.SEEK_END: len(self._view)}
+        self._offset = max(0, min(base[whence] + offset, len(self._view)))
+        return self._offset
+
+    def tell(self) -> int:
+        return self._offset
+
+
+def open_upload(value: Any, stack: ExitStack) -> IO[bytes] | BufferReader:
+    """Turn an upload argument into a file-like object readable in chunks.
+
+    Only ``pathlib.Path`` values are opened as files; strings are sent as
+    their UTF-8 encoded text.
+
+    Args:
+        value: A Path, string, bytes-like buffer or binary file object.
+        stack: Exit stack that owns any file opened here.
+
+    Returns:
+        A file-like object positioned at the start of the content.
+
+    Raises:
+        ValueError: If the value is not one of the accepted upload types.
+    """
+    if isinstance(value, Path):
+        return stack.enter_context(value.open("rb"))
+    if isinstance(value, str):
+        return BufferReader(value.encode(TEXT_ENCODING))
+    if isinstance(value, BufferTypes):
+        return BufferReader(value)
+    if hasattr(value, "read"):
+        return value
+    raise ValueError(f"Cannot upload a {type(value).__name__}; pass str, bytes, Path or a file")
+
+
+def mark_uploads(values: Iterable[Any]) -> list[tuple[Any, int]] | None:
+    """Record where caller-supplied file objects start, so a request can be resent.
+
+    Paths, strings and buffers are reopened for every send and need no mark.
+
+    Args:
+        values: Argument values that may hold file objects.
+
+    Returns:
+        ``(file, position)`` pairs to pass to ``rewind_uploads``, or None if
+        a file object cannot seek and the request therefore cannot be resent.
+    """
+    marks: list[tuple[Any, int]] = []
+    for value in values:
+        if not hasattr(value, "read") or isinstance(value, (str, Path, *BufferTypes)):
+            continue
+        seekable = getattr(value, "seekable", None)
+        try:
+            if (seekable is not None and not seekable()) or not hasattr(value, "seek"):
+                return None
+            marks.append((value, value.tell()))
+        except (AttributeError, OSError, ValueError):
+            return None
+    return marks
+
+
+def rewind_uploads(marks: list[tuple[Any, int]]) -> None:
+    """Seek file objects back to the positions recorded by ``mark_uploads``."""
+    for source, position in marks:
+        source.seek(position)
+
+
+def content_length(source: Any) -> int | None:
+    """Return the size of upload content without reading it, if knowable.
+
+    Real files are sized with ``fstat``; other seekable streams such as
+    ``io.BytesIO`` by seeking to their end and back.
+    """
+    if isinstance(source, BufferReader):
+        return len(source._view)
+    try:
+        return os.fstat(source.fileno()).st_size - source.tell()
+    except (AttributeError, OSError):
+        pass
+    try:
+        if not source.seekable():
+            return None
+        position = source.tell()
+        end = source.seek(0, os.SEEK_END)
+        source.seek(position)
+    except (AttributeError, OSError, ValueError):
+        return None
+    return end - position
+
+
+async def iter_chunks(source: Any) -> AsyncIterator[bytes]:
+    """Stream a file-like object as ``CHUNK_SIZE`` chunks.
+
+    Args:
+        source: Object returned by ``open_upload``.
+
+    Yields:
+        Successive chunks until the source is exhausted.
+    """
+    chunk = source.read(CHUNK_SIZE)
+    while chunk:
+        yield chunk
+        chunk = source.read(CHUNK_SIZE)
+
+
+def encode_body(request: "APIRequest", stack: ExitStack) -> tuple[dict[str, Any], dict[str, str]]:
+    """Build the httpx body keyword arguments for an APIRequest.
+
+    Files referenced by Path are opened on ``stack`` and only read while the
+    request is being sent.
+
+    Args:
+        request: The APIRequest to encode.
+        stack: Exit stack that owns any file opened for the request.
+
+    Returns:
+        A tuple of keyword arguments for ``httpx.AsyncClient.request`` and
+        extra headers the encoding requires.
+    """
+    kind = content_kind(request.content_type)
+    if kind == "form":
+        return {"data": request.form_data}, {}
+    if kind == "multipart":
+        files = {
+            name: (value.name if isinstance(value, Path) else name, open_upload(value, stack))
+            for name, value in (request.files or {}).items()
+        }
+        return {"data": request.form_data or {}, "files": files}, {}
+    if kind in ("text", "binary"):
+        if request.content is None:
+            return {}, {}
+        source = open_upload(request.content, stack)
+        length = content_length(source)
+        headers = {"Content-Length": str(length)} if length is not None else {}
+        return {"content": iter_chunks(source)}, headers
+    return {"json": request.json_body}, {}
@@ -1,4 +1,203 @@
+import weakref
 from dataclasses import dataclass, field
+from typing import Any
+
+
+@dataclass(frozen=True, slots=True, weakref_slot=True, eq=False)
+class SchemaNode:
+    """Immutable, hashable node of a JSON schema tree.
+
+    Nodes are interned with ``intern_schema`` so that identical sub-schemas
+    (e.g. a shared ``Address`` component) are represented by a single object.
+    Equality and hashing compare ``enum`` values together with their types,
+    since ``1 == True`` would otherwise merge integer and boolean enums.
+    ``additional_properties`` is a schema for the values of a map-like
+    object, ``True``/``False`` to allow or forbid extra keys, or None when
+    unspecified.
+    """
+
+    type: str = ""
+    description: str = ""
+    format: str = ""
+    properties: tuple[tuple[str, "SchemaNode"], ...] = ()
+    required: tuple[str, ...] = ()
+    items: "SchemaNode | None" = None
+    enum: tuple[Any, ...] = ()
+    one_of: tuple["SchemaNode", ...] = ()
+    any_of: tuple["SchemaNode", ...] = ()
+    all_of: tuple["SchemaNode", ...] = ()
+    nullable: bool = False
+    additional_properties: "SchemaNode | bool | None" = None
+
+    def _key(self) -> tuple[Any, ...]:
+        return (
+            self.type,
+            self.description,
+            self.format,
+            self.properties,
+            self.required,
+            self.items,
+            tuple((type(value).__name__, value) for value in self.enum),
+            self.one_of,
+            self.any_of,
+            self.all_of,
+            self.nullable,
+            self.additional_properties,
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, SchemaNode):
+            return NotImplemented
+        return self is other or self._key() == other._key()
+
+    def __hash__(self) -> int:
+        return hash(self._key())
+
+    @property
+    def is_object(self) -> bool:
+        """Whether the node describes a JSON object with named properties."""
+        return self.type == "object" or (not self.type and bool(self.properties))
+
+    def get_property(self, name: str) -> "SchemaNode | None":
+        """Return the sub-schema of a named property, if present."""
+        for prop_name, node in self.properties:
+            if prop_name == name:
+                return node
+        return None
+
+    def to_json_schema(self) -> dict[str, Any]:
+        """Render the node back into a plain JSON schema dict.
+
+        Returns:
+            A JSON schema dict suitable for LLM function-calling payloads.
+        """
+        schema: dict[str, Any] = {}
+        if self.type:
+            schema["type"] = self.type
+        if self.description:
+            schema["description"] = self.description
+        if self.format:
+            schema["format"] = self.format
+        if self.properties:
+            schema["properties"] = {name: node.to_json_schema() for name, node in self.properties}
+        if self.required:
+            schema["required"] = list(self.required)
+        if self.items is not None:
+            schema["items"] = self.items.to_json_schema()
+        if self.enum:
+            schema["enum"] = list(self.enum)
+        if self.one_of:
+            schema["oneOf"] = [node.to_json_schema() for node in self.one_of]
+        if self.any_of:
+            schema["anyOf"] = [node.to_json_schema() for node in self.any_of]
+        if self.all_of:
+            schema["allOf"] = [node.to_json_schema() for node in self.all_of]
+        if self.nullable:
+            schema["nullable"] = True
+        if isinstance(self.additional_properties, SchemaNode):
+            schema["additionalProperties"] = self.additional_properties.to_json_schema()
+        elif self.additional_properties is not None:
+            schema["additionalProperties"] = self.additional_properties
+        return schema
+
+
+_SCHEMA_INTERN_TABLE: "weakref.WeakValueDictionary[SchemaNode, SchemaNode]" = (
+    weakref.WeakValueDictionary()
+)
+
+
+def intern_schema(node: SchemaNode) -> SchemaNode:
+    """Return the canonical instance for a schema node.
+
+    Args:
+        node: A freshly built schema node.
+
+    Returns:
+        An equal, previously interned node if one is alive, otherwise ``node``.
+        Nodes with unhashable enum values are returned as-is.
+    """
+    try:
+        canonical = _SCHEMA_INTERN_TABLE.get(node)
+    except TypeError:
+        return node
+    if canonical is None:
+        _SCHEMA_INTERN_TABLE[node] = node
+        return node
+    return canonical
+
+
+@dataclass(frozen=True)
+class ServerVariable:
+    """Substitution variable of an OpenAPI server URL template."""
+
+    default: str
+    enum: tuple[str, ...] = ()
+    description: str = ""
+
+
+@dataclass(frozen=True)
+class ServerDef:
+    """One entry of an OpenAPI ``servers`` list."""
+
+    url: str
+    description: str = ""
+    variables: tuple[tuple[str, ServerVariable], ...] = ()
+
+    def resolve(self, overrides: dict[str, str] | None = None) -> str:
+        """Expand the URL template with variable defaults and overrides.
+
+        Args:
+            overrides: Values taking precedence over the variable defaults.
+
+        Returns:
+            The concrete server URL without a trailing slash.
+
+        Raises:
+            ValueError: If an override is not one of a variable's allowed values.
+        """
+        overrides = overrides or {}
+        url = self.url
+        for name, variable in self.variables:
+            value = overrides.get(name, variable.default)
+            if variable.enum and value not in variable.enum:
+                raise ValueError(f"Server variable {name!r} must be one of {variable.enum}")
+            url = url.replace(f"{{{name}}}", value)
+        return url.rstrip("/")
+
+
+@dataclass(frozen=True)
+class PaginationDef:
+    """How a list operation is paginated.
+
+    ``style`` is one of ``"cursor"``, ``"page"``, ``"offset"`` or ``"link"``.
+    Field paths are dotted paths into the decoded JSON response body; an
+    empty ``items_field`` means the body itself is the list of items.
+    """
+
+    style: str
+    param: str = ""
+    limit_param: str = ""
+    next_field: str = ""
+    items_field: str = ""
+
+
+@dataclass(frozen=True)
+class SecuritySchemeDef:
+    """Security scheme declared under ``components.securitySchemes``.
+
+    ``location`` and ``param_name`` describe where an ``apiKey`` is sent,
+    ``scheme`` is the ``http`` auth scheme (e.g. ``bearer``), and
+    ``token_url`` and ``scopes`` come from an ``oauth2`` client-credentials
+    flow.
+    """
+
+    name: str
+    type: str
+    location: str = ""
+    param_name: str = ""
+    scheme: str = ""
+    token_url: str = ""
+    scopes: tuple[str, ...] = ()
 
 
 @dataclass
@@ -10,6 +209,7 @@ class ParameterDef:
     required: bool
     location: str  # "path", "query", "body"
     description: str = ""
+    schema: SchemaNode | None = None
 
 
 @dataclass
@@ -22,3 +222,8 @@ class ToolDefinition:
     path: str
     parameters: list[ParameterDef] = field(default_factory=list)
     base_url: str = ""
+    body_schema: SchemaNode | None = None
+    content_types: list[str] = field(default_factory=list)
+    servers: list[ServerDef] = field(default_factory=list)
+    pagination: PaginationDef | None = None
+    security: list[dict[str, list[str]]] = field(default_factory=list)
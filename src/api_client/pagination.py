@@ -0,0 +1,214 @@
+"""Pagination detection and page-walking helpers for list endpoints."""
+
+import re
+from typing import Any
+from urllib.parse import urljoin, urlsplit
+
+from api_client.models import PaginationDef, ParameterDef, SchemaNode
+
+CURSOR_PARAMS = (
+    "cursor",
+    "after",
+    "page_token",
+    "pageToken",
+    "next_token",
+    "nextToken",
+    "starting_after",
+    "continuation_token",
+)
+PAGE_PARAMS = ("page", "page_number", "pageNumber")
+OFFSET_PARAMS = ("offset", "skip")
+LIMIT_PARAMS = ("limit", "per_page", "page_size", "pageSize", "size", "max_results", "maxResults")
+ITEMS_FIELDS = ("data", "items", "results", "records", "entries", "values")
+NEXT_FIELDS = (
+    "next_cursor",
+    "nextCursor",
+    "next_page_token",
+    "nextPageToken",
+    "next_token",
+    "nextToken",
+    "next",
+)
+CONTAINER_FIELDS = ("meta", "pagination", "paging", "page_info", "pageInfo", "links", "_links")
+LINK_HEADER = "link"
+PAGINATION_EXTENSION = "x-pagination"
+PAGINATION_STYLES = ("cursor", "page", "offset", "link")
+URL_CURSOR_PREFIXES = ("http://", "https://", "/", "?")
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+_LINK_NEXT_PATTERN = re.compile(r'<([^>]*)>\s*;[^,]*\brel="?next"?', re.IGNORECASE)
+
+
+def _find_field(schema: SchemaNode | None, names: tuple[str, ...]) -> str:
+    """Find a property by name at the top level or one container level down.
+
+    Returns:
+        The dotted path of the first match, or an empty string.
+    """
+    if schema is None:
+        return ""
+    for name in names:
+        if schema.get_property(name) is not None:
+            return name
+    for container in CONTAINER_FIELDS:
+        nested = schema.get_property(container)
+        if nested is None:
+            continue
+        for name in names:
+            if nested.get_property(name) is not None:
+                return f"{container}.{name}"
+    return ""
+
+
+def _items_field(schema: SchemaNode | None) -> str:
+    """Locate the list of items in a response schema."""
+    if schema is None or schema.type == "array":
+        return ""
+    field = _find_field(schema, ITEMS_FIELDS)
+    if field:
+        return field
+    arrays = [name for name, node in schema.properties if node.type == "array"]
+    return arrays[0] if len(arrays) == 1 else ""
+
+
+def detect_pagination(
+    parameters: list[ParameterDef],
+    response_schema: SchemaNode | None = None,
+    response_headers: frozenset[str] = frozenset(),
+    extension: dict[str, Any] | None = None,
+) -> PaginationDef | None:
+    """Work out how a list operation is paginated.
+
+    An ``x-pagination`` extension on the operation wins; otherwise the style
+    is inferred from well-known query parameter names, falling back to the
+    ``Link`` header when the success response declares one.
+
+    Args:
+        parameters: The operation's parameters.
+        response_schema: Schema of the JSON success response, if any.
+        response_headers: Lower-cased header names of the success response.
+        extension: The operation's ``x-pagination`` object, if any.
+
+    Returns:
+        The detected PaginationDef, or None for unpaginated operations.
+
+    Raises:
+        ValueError: If the extension names an unknown pagination style.
+    """
+    if extension:
+        if extension.get("style") not in PAGINATION_STYLES:
+            raise ValueError(f"Unknown pagination style: {extension.get('style')!r}")
+        return PaginationDef(
+            style=extension["style"],
+            param=extension.get("param", ""),
+            limit_param=extension.get("limit_param", ""),
+            next_field=extension.get("next_field", ""),
+            items_field=extension.get("items_field", _items_field(response_schema)),
+        )
+    query = {p.name for p in parameters if p.location == "query"}
+    limit_param = next((name for name in LIMIT_PARAMS if name in query), "")
+    items_field = _items_field(response_schema)
+    for style, candidates in (
+        ("cursor", CURSOR_PARAMS),
+        ("page", PAGE_PARAMS),
+        ("offset", OFFSET_PARAMS),
+    ):
+        param = next((name for name in candidates if name in query), "")
+        if param:
+            return PaginationDef(
+                style=style,
+                param=param,
+                limit_param=limit_param,
+                next_field=_find_field(response_schema, NEXT_FIELDS) if style == "cursor" else "",
+                items_field=items_field,
+            )
+    if LINK_HEADER in response_headers:
+        return PaginationDef(style="link", limit_param=limit_param, items_field=items_field)
+    return None
+
+
+def origin(url: str) -> tuple[str, str, int | None]:
+    """Return the (scheme, host, port) origin of a URL, with default ports filled in."""
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    return scheme, (parts.hostname or "").lower(), parts.port or DEFAULT_PORTS.get(scheme)
+
+
+def get_field(body: Any, path: str) -> Any:
+    """Read a dotted field path from a decoded JSON body, or None if absent."""
+    value = body
+    for part in path.split(".") if path else ():
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+def extract_items(body: Any, pagination: PaginationDef) -> list[Any]:
+    """Return the items of one page.
+
+    Args:
+        body: Decoded response body.
+        pagination: How the operation is paginated.
+
+    Returns:
+        The page's items; a non-list body counts as a single item.
+    """
+    items = get_field(body, pagination.items_field) if pagination.items_field else body
+    if isinstance(items, list):
+        return items
+    return [] if items is None else [items]
+
+
+def next_link(headers: dict[str, str]) -> str | None:
+    """Return the ``rel="next"`` target of an RFC 8288 ``Link`` header."""
+    header = next((value for key, value in headers.items() if key.lower() == LINK_HEADER), "")
+    match = _LINK_NEXT_PATTERN.search(header)
+    return match.group(1) if match else None
+
+
+def next_page(
+    pagination: PaginationDef,
+    arguments: dict[str, Any],
+    body: Any,
+    headers: dict[str, str],
+    item_count: int,
+    response_url: str = "",
+) -> tuple[dict[str, Any], str | None] | None:
+    """Compute the request for the page after the one just received.
+
+    Args:
+        pagination: How the operation is paginated.
+        arguments: Arguments used for the page just received.
+        body: Decoded body of that page.
+        headers: Response headers of that page.
+        item_count: Number of items on that page.
+        response_url: URL of that page, which relative ``Link`` targets and
+            relative ``next`` URLs are resolved against.
+
+    Returns:
+        The next page's arguments and, for link-style pagination or ``next``
+        fields holding a URL, the absolute URL to request; None when this was
+        the last page.
+    """
+    if pagination.style in ("page", "offset"):
+        limit = arguments.get(pagination.limit_param) if pagination.limit_param else None
+        if item_count == 0 or (isinstance(limit, int) and item_count < limit):
+            return None
+        current = arguments.get(pagination.param)
+        if pagination.style == "page":
+            following = (current if isinstance(current, int) else 1) + 1
+        else:
+            following = (current if isinstance(current, int) else 0) + item_count
+        return {**arguments, pagination.param: following}, None
+
+    if pagination.style == "cursor" and pagination.next_field:
+        cursor = get_field(body, pagination.next_field)
+        if isinstance(cursor, str) and cursor.startswith(URL_CURSOR_PREFIXES):
+            return arguments, urljoin(response_url, cursor)
+        if cursor in (None, "") or cursor == arguments.get(pagination.param):
+            return None
+        return {**arguments, pagination.param: cursor}, None
+
+    link = next_link(headers)
+    return (arguments, urljoin(response_url, link)) if link else None
@@ -1,12 +1,51 @@
 """OpenAPI spec parser that generates tool definitions."""
 
+import os
 from typing import Any
 
-from api_client.models import ParameterDef, ToolDefinition
+from api_client.catalog import write_catalog
+from api_client.encoding import JSON_CONTENT_TYPE, content_kind
+from api_client.models import (
+    PaginationDef,
+    ParameterDef,
+    SchemaNode,
+    SecuritySchemeDef,
+    ServerDef,
+    ServerVariable,
+    ToolDefinition,
+    intern_schema,
+)
+from api_client.pagination import PAGINATION_EXTENSION, detect_pagination
 
 SUPPORTED_HTTP_METHODS = ("get", "post", "put", "patch", "delete")
+SUCCESS_STATUS_CODES = ("200", "2XX", "default")
 DEFAULT_PARAM_TYPE = "string"
-JSON_CONTENT_TYPE = "application/json"
+BINARY_BODY_SCHEMA = {"type": "string", "format": "binary"}
+TEXT_BODY_SCHEMA = {"type": "string"}
+RAW_BODY_PARAM = "body"
+LOCAL_REF_PREFIX = "#/"
+ENUM_VALUE_TYPES = ((bool, "boolean"), (int, "integer"), (float, "number"), (str, "string"))
+
+
+def enum_type(values: Any) -> str:
+    """Infer the JSON schema type shared by a list of enum values.
+
+    Args:
+        values: The ``enum`` values of a schema without an explicit type.
+
+    Returns:
+        The common JSON type (integers and floats combine to ``"number"``),
+        or an empty string when the values have no single type.
+    """
+    types = set()
+    for value in values:
+        json_type = next((name for kind, name in ENUM_VALUE_TYPES if isinstance(value, kind)), "")
+        if not json_type:
+            return ""
+        types.add(json_type)
+    if types == {"integer", "number"}:
+        return "number"
+    return types.pop() if len(types) == 1 else ""
 
 
 class OpenAPIParser:
@@ -14,8 +53,11 @@ class OpenAPIParser:
 
     def __init__(self, spec: dict[str, Any]) -> None:
         self.spec: dict[str, Any] = spec
-        servers: list[dict[str, Any]] = spec.get("servers", [])
-        self.base_url: str = servers[0]["url"] if servers else ""
+        self.servers: list[ServerDef] = self._parse_servers(spec.get("servers", []))
+        self.base_url: str = self.servers[0].resolve() if self.servers else ""
+        self.security_schemes: dict[str, SecuritySchemeDef] = self._parse_security_schemes()
+        self._ref_cache: dict[str, SchemaNode] = {}
+        self._resolving: set[str] = set()
 
     def parse(self) -> list[ToolDefinition]:
         """Parse all paths and operations into a list of ToolDefinitions.
@@ -25,10 +67,15 @@ class OpenAPIParser:
         """
         tools: list[ToolDefinition] = []
         for path, methods in self.spec.get("paths", {}).items():
+            path_servers = self._parse_servers(methods.get("servers", [])) or self.servers
             for method, operation in methods.items():
                 if method not in SUPPORTED_HTTP_METHODS:
                     continue
-                params = self._extract_parameters(operation)
+                servers = self._parse_servers(operation.get("servers", [])) or path_servers
+                content_types = self._body_content_types(operation)
+                body_schema = self._extract_body_schema(operation, content_types)
+                params = self._extract_parameters(operation, body_schema)
+                pagination = self._extract_pagination(method, operation, params)
                 tools.append(
                     ToolDefinition(
                         name=operation.get("operationId", f"{method}_{path}"),
@@ -36,61 +83,335 @@ class OpenAPIParser:
                         method=method.upper(),
                         path=path,
                         parameters=params,
-                        base_url=self.base_url,
+                        base_url=servers[0].resolve() if servers else "",
+                        body_schema=body_schema,
+                        content_types=content_types,
+                        servers=servers,
+                        pagination=pagination,
+                        security=[
+                            {name: list(scopes) for name, scopes in requirement.items()}
+                            for requirement in operation.get(
+                                "security", self.spec.get("security", [])
+                            )
+                        ],
                     )
                 )
         return tools
 
-    def _extract_parameters(self, operation: dict[str, Any]) -> list[ParameterDef]:
+    def _parse_security_schemes(self) -> dict[str, SecuritySchemeDef]:
+        """Convert ``components.securitySchemes`` into SecuritySchemeDef objects.
+
+        Returns:
+            Mapping of scheme name to its definition.
+        """
+        schemes: dict[str, SecuritySchemeDef] = {}
+        raw_schemes = self.spec.get("components", {}).get("securitySchemes", {})
+        for name, raw in raw_schemes.items():
+            raw = self._deref(raw)
+            flow: dict[str, Any] = raw.get("flows", {}).get("clientCredentials", {})
+            schemes[name] = SecuritySchemeDef(
+                name=name,
+                type=raw["type"],
+                location=raw.get("in", ""),
+                param_name=raw.get("name", ""),
+                scheme=raw.get("scheme", "").lower(),
+                token_url=flow.get("tokenUrl", ""),
+                scopes=tuple(flow.get("scopes", {})),
+            )
+        return schemes
+
+    @staticmethod
+    def _parse_servers(raw_servers: list[dict[str, Any]]) -> list[ServerDef]:
+        """Convert a raw ``servers`` list into ServerDef objects.
+
+        Args:
+            raw_servers: The ``servers`` array of the spec, a path or an operation.
+
+        Returns:
+            The servers in declaration order.
+        """
+        return [
+            ServerDef(
+                url=server["url"],
+                description=server.get("description", ""),
+                variables=tuple(
+                    (
+                        name,
+                        ServerVariable(
+                            default=str(variable["default"]),
+                            enum=tuple(str(value) for value in variable.get("enum", ())),
+                            description=variable.get("description", ""),
+                        ),
+                    )
+                    for name, variable in server.get("variables", {}).items()
+                ),
+            )
+            for server in raw_servers
+        ]
+
+    def _extract_parameters(
+        self, operation: dict[str, Any], body_schema: SchemaNode | None = None
+    ) -> list[ParameterDef]:
         """Extract path, query, and body parameters from a single operation.
 
+        Object request bodies are flattened into one body parameter per
+        top-level property; any other body schema, including objects without
+        named properties (e.g. maps described only by
+        ``additionalProperties``), becomes a single ``body`` parameter
+        carrying the whole payload.
+
         Args:
             operation: The OpenAPI operation object.
+            body_schema: The operation's JSON body schema, if any.
 
         Returns:
             A list of ParameterDef objects for the operation.
         """
         params: list[ParameterDef] = []
         for p in operation.get("parameters", []):
+            p = self._deref(p)
+            schema = self.build_schema(p.get("schema", {}))
             params.append(
                 ParameterDef(
                     name=p["name"],
-                    type=p.get("schema", {}).get("type", DEFAULT_PARAM_TYPE),
+                    type=schema.type or enum_type(schema.enum) or DEFAULT_PARAM_TYPE,
                     required=p.get("required", False),
                     location=p["in"],
                     description=p.get("description", ""),
+                    schema=schema,
                 )
             )
-        request_body: dict[str, Any] = operation.get("requestBody", {})
-        if request_body:
-            content: dict[str, Any] = request_body.get("content", {})
-            json_schema: dict[str, Any] = content.get(JSON_CONTENT_TYPE, {}).get("schema", {})
-            required_fields: set[str] = set(json_schema.get("required", []))
-            for prop_name, prop_schema in json_schema.get("properties", {}).items():
+        if body_schema is None:
+            return params
+        if body_schema.is_object and body_schema.properties:
+            required_fields = set(body_schema.required)
+            for prop_name, prop_schema in body_schema.properties:
                 params.append(
                     ParameterDef(
                         name=prop_name,
-                        type=prop_schema.get("type", DEFAULT_PARAM_TYPE),
+                        type=prop_schema.type or enum_type(prop_schema.enum) or DEFAULT_PARAM_TYPE,
                         required=prop_name in required_fields,
                         location="body",
-                        description=prop_schema.get("description", ""),
+                        description=prop_schema.description,
+                        schema=prop_schema,
                     )
                 )
+        else:
+            request_body = self._deref(operation.get("requestBody", {}))
+            params.append(
+                ParameterDef(
+                    name=RAW_BODY_PARAM,
+                    type=body_schema.type or enum_type(body_schema.enum) or DEFAULT_PARAM_TYPE,
+                    required=request_body.get("required", False),
+                    location="body",
+                    description=body_schema.description or request_body.get("description", ""),
+                    schema=body_schema,
+                )
+            )
         return params
 
-    def to_openai_tools(self) -> list[dict[str, Any]]:
+    def _extract_pagination(
+        self, method: str, operation: dict[str, Any], params: list[ParameterDef]
+    ) -> PaginationDef | None:
+        """Detect how a read operation pages through its results.
+
+        Args:
+            method: The lower-cased HTTP method.
+            operation: The OpenAPI operation object.
+            params: The operation's extracted parameters.
+
+        Returns:
+            The PaginationDef, or None if the operation is not paginated.
+        """
+        extension: dict[str, Any] | None = operation.get(PAGINATION_EXTENSION)
+        if method != "get" and not extension:
+            return None
+        responses: dict[str, Any] = operation.get("responses", {})
+        status = next((code for code in SUCCESS_STATUS_CODES if code in responses), None)
+        response: dict[str, Any] = self._deref(responses[status]) if status else {}
+        media: dict[str, Any] = response.get("content", {}).get(JSON_CONTENT_TYPE, {})
+        schema = self.build_schema(media["schema"]) if "schema" in media else None
+        headers = frozenset(name.lower() for name in response.get("headers", {}))
+        return detect_pagination(params, schema, headers, extension)
+
+    def _body_content_types(self, operation: dict[str, Any]) -> list[str]:
+        """List the media types an operation's request body accepts.
+
+        JSON media types are moved to the front, so the first entry is the one
+        the body parameters are modeled on and the caller encodes by default.
+
+        Args:
+            operation: The OpenAPI operation object.
+
+        Returns:
+            The accepted media types, empty when the operation has no body.
+        """
+        request_body: dict[str, Any] = self._deref(operation.get("requestBody", {}))
+        content_types = list(request_body.get("content", {}))
+        return sorted(content_types, key=lambda ct: content_kind(ct) != "json")
+
+    def _extract_body_schema(
+        self, operation: dict[str, Any], content_types: list[str]
+    ) -> SchemaNode | None:
+        """Build the schema node of an operation's primary request body.
+
+        Args:
+            operation: The OpenAPI operation object.
+            content_types: The accepted media types, primary first.
+
+        Returns:
+            The body schema with ``allOf`` object parts merged, or None when
+            the operation has no request body. Text and binary bodies without
+            a schema are modeled as a string, with ``format: binary`` for the
+            latter.
+        """
+        if not content_types:
+            return None
+        request_body: dict[str, Any] = self._deref(operation.get("requestBody", {}))
+        media: dict[str, Any] = request_body["content"][content_types[0]] or {}
+        raw_schema = media.get("schema")
+        kind = content_kind(content_types[0])
+        if raw_schema is None and kind == "binary":
+            raw_schema = BINARY_BODY_SCHEMA
+        elif raw_schema is None and kind == "text":
+            raw_schema = TEXT_BODY_SCHEMA
+        schema = self.build_schema(raw_schema or {})
+        return self._merge_all_of(schema)
+
+    def build_schema(self, raw: dict[str, Any]) -> SchemaNode:
+        """Convert a raw OpenAPI schema dict into an interned SchemaNode.
+
+        Local ``$ref`` targets are resolved once and shared between every
+        operation that references them. Recursive references are cut at the
+        point of recursion with an untyped object node.
+
+        Args:
+            raw: The raw schema object from the spec.
+
+        Returns:
+            The interned SchemaNode for the schema.
+        """
+        ref: str | None = raw.get("$ref")
+        if ref is not None:
+            cached = self._ref_cache.get(ref)
+            if cached is not None:
+                return cached
+            if ref in self._resolving:
+                return intern_schema(SchemaNode(type="object"))
+            self._resolving.add(ref)
+            try:
+                node = self.build_schema(self._resolve_ref(ref))
+            finally:
+                self._resolving.discard(ref)
+            self._ref_cache[ref] = node
+            return node
+
+        items = raw.get("items")
+        enum = raw.get("enum", ())
+        additional = raw.get("additionalProperties")
+        node = SchemaNode(
+            type=raw.get("type", ""),
+            description=raw.get("description", ""),
+            format=raw.get("format", ""),
+            properties=tuple(
+                (name, self.build_schema(sub)) for name, sub in raw.get("properties", {}).items()
+            ),
+            required=tuple(raw.get("required", ())),
+            items=self.build_schema(items) if items is not None else None,
+            enum=tuple(enum),
+            one_of=tuple(self.build_schema(sub) for sub in raw.get("oneOf", ())),
+            any_of=tuple(self.build_schema(sub) for sub in raw.get("anyOf", ())),
+            all_of=tuple(self.build_schema(sub) for sub in raw.get("allOf", ())),
+            nullable=raw.get("nullable", False),
+            additional_properties=(
+                self.build_schema(additional) if isinstance(additional, dict) else additional
+            ),
+        )
+        return intern_schema(node)
+
+    @staticmethod
+    def _merge_all_of(node: SchemaNode) -> SchemaNode:
+        """Fold the object members of an ``allOf`` into a single object node.
+
+        Args:
+            node: A schema node that may compose other schemas via ``allOf``.
+
+        Returns:
+            A flattened object node, or ``node`` unchanged when there is nothing
+            to merge.
+        """
+        if not node.all_of or not all(part.is_object for part in node.all_of):
+            return node
+        properties: dict[str, SchemaNode] = dict(node.properties)
+        required: list[str] = list(node.required)
+        additional = node.additional_properties
+        for part in node.all_of:
+            merged = OpenAPIParser._merge_all_of(part)
+            properties.update(merged.properties)
+            required.extend(name for name in merged.required if name not in required)
+            if additional is None:
+                additional = merged.additional_properties
+        return intern_schema(
+            SchemaNode(
+                type="object",
+                description=node.description,
+                properties=tuple(properties.items()),
+                required=tuple(required),
+                nullable=node.nullable,
+                additional_properties=additional,
+            )
+        )
+
+    def _deref(self, obj: dict[str, Any]) -> dict[str, Any]:
+        """Follow a ``$ref`` on a non-schema object such as a parameter."""
+        ref: str | None = obj.get("$ref")
+        return self._resolve_ref(ref) if ref is not None else obj
+
+    def _resolve_ref(self, ref: str) -> dict[str, Any]:
+        """Look up a local JSON pointer (``#/components/...``) in the spec.
+
+        Args:
+            ref: The ``$ref`` string.
+
+        Returns:
+            The referenced object.
+
+        Raises:
+            ValueError: If the reference is not local or cannot be found.
+        """
+        if not ref.startswith(LOCAL_REF_PREFIX):
+            raise ValueError(f"Unsupported non-local $ref: {ref}")
+        target: Any = self.spec
+        for token in ref[len(LOCAL_REF_PREFIX) :].split("/"):
+            token = token.replace("~1", "/").replace("~0", "~")
+            if not isinstance(target, dict) or token not in target:
+                raise ValueError(f"Unresolvable $ref: {ref}")
+            target = target[token]
+        return target
+
+    def to_openai_tools(self, tools: list[ToolDefinition] | None = None) -> list[dict[str, Any]]:
         """Convert parsed tools into OpenAI function-calling format.
 
+        Args:
+            tools: Already parsed tools to convert. Defaults to parsing the spec.
+
         Returns:
             A list of dicts conforming to the OpenAI tools schema.
         """
-        tools = self.parse()
+        if tools is None:
+            tools = self.parse()
         openai_tools: list[dict[str, Any]] = []
         for tool in tools:
-            properties: dict[str, dict[str, str]] = {}
+            properties: dict[str, dict[str, Any]] = {}
             required: list[str] = []
             for p in tool.parameters:
-                properties[p.name] = {"type": p.type, "description": p.description}
+                prop = p.schema.to_json_schema() if p.schema is not None else {}
+                if not any(key in prop for key in ("type", "oneOf", "anyOf", "allOf")):
+                    param_type = enum_type(prop["enum"]) if "enum" in prop else p.type
+                    if param_type:
+                        prop = {"type": param_type, **prop}
+                prop["description"] = p.description
+                properties[p.name] = prop
                 if p.required:
                     required.append(p.name)
             openai_tools.append(
@@ -108,3 +429,16 @@ class OpenAPIParser:
                 }
             )
         return openai_tools
+
+    def export_catalog(self, path: str | os.PathLike[str]) -> list[ToolDefinition]:
+        """Parse the spec and write the tools to a memory-mappable catalog file.
+
+        Args:
+            path: Destination of the catalog, to be opened with ToolCatalog.open.
+
+        Returns:
+            The parsed ToolDefinitions that were written.
+        """
+        tools = self.parse()
+        write_catalog(path, tools, self.to_openai_tools(tools))
+        return tools
@@ -0,0 +1,128 @@
+"""Latency-aware server selection with passive and active health tracking."""
+
+import asyncio
+import time
+from dataclasses import dataclass
+
+import httpx
+
+DEFAULT_EWMA_ALPHA = 0.3
+DEFAULT_FAILURE_THRESHOLD = 1
+DEFAULT_COOLDOWN_SECONDS = 30.0
+DEFAULT_HEALTH_TIMEOUT_SECONDS = 5.0
+SERVER_ERROR_STATUS = 500
+
+
+@dataclass
+class ServerStats:
+    """Observed health and latency of a single server URL."""
+
+    ewma_latency: float | None = None
+    consecutive_failures: int = 0
+    unhealthy_until: float = 0.0
+
+
+class ServerRouter:
+    """Orders candidate servers by observed latency and health.
+
+    Each response time updates an exponentially weighted moving average
+    (EWMA) for its server. Servers with no samples yet rank first so every
+    endpoint gets measured. A server that fails ``failure_threshold`` times
+    in a row is skipped for ``cooldown`` seconds, after which it is tried
+    again; if every candidate is cooling down they are all returned, ordered
+    by latency, rather than failing the call outright.
+    """
+
+    def __init__(
+        self,
+        alpha: float = DEFAULT_EWMA_ALPHA,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        cooldown: float = DEFAULT_COOLDOWN_SECONDS,
+    ) -> None:
+        self.alpha = alpha
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.stats: dict[str, ServerStats] = {}
+
+    def _stats(self, url: str) -> ServerStats:
+        stats = self.stats.get(url)
+        if stats is None:
+            stats = self.stats[url] = ServerStats()
+        return stats
+
+    def is_healthy(self, url: str, now: float | None = None) -> bool:
+        """Whether a server is outside its failure cooldown."""
+        now = time.monotonic() if now is None else now
+        return self._stats(url).unhealthy_until <= now
+
+    def rank(self, urls: list[str]) -> list[str]:
+        """Order candidate server URLs from most to least preferred.
+
+        Args:
+            urls: Resolved server URLs in spec declaration order.
+
+        Returns:
+            Healthy servers by ascending EWMA latency (unmeasured first,
+            declaration order breaking ties), followed by cooling-down ones.
+        """
+        now = time.monotonic()
+
+        def key(indexed: tuple[int, str]) -> tuple[bool, float, int]:
+            index, url = indexed
+            latency = self._stats(url).ewma_latency
+            return (not self.is_healthy(url, now), latency or 0.0, index)
+
+        return [url for _, url in sorted(enumerate(urls), key=key)]
+
+    def record_success(self, url: str, latency: float) -> None:
+        """Fold a response time into the server's EWMA and clear its failures."""
+        stats = self._stats(url)
+        if stats.ewma_latency is None:
+            stats.ewma_latency = latency
+        else:
+            stats.ewma_latency = self.alpha * latency + (1 - self.alpha) * stats.ewma_latency
+        stats.consecutive_failures = 0
+        stats.unhealthy_until = 0.0
+
+    def record_failure(self, url: str) -> None:
+        """Count a failed attempt and start a cooldown past the threshold."""
+        stats = self._stats(url)
+        stats.consecutive_failures += 1
+        if stats.consecutive_failures >= self.failure_threshold:
+            stats.unhealthy_until = time.monotonic() + self.cooldown
+
+    async def check_health(
+        self,
+        client: httpx.AsyncClient,
+        urls: list[str],
+        path: str = "",
+        timeout: float = DEFAULT_HEALTH_TIMEOUT_SECONDS,
+    ) -> dict[str, bool]:
+        """Actively probe servers concurrently with a GET and record the outcomes.
+
+        Args:
+            client: HTTP client used for the probes.
+            urls: Server URLs to probe.
+            path: Health endpoint appended to each server URL.
+            timeout: Per-probe timeout in seconds.
+
+        Returns:
+            Mapping of server URL to whether its probe succeeded.
+        """
+
+        async def probe(url: str) -> bool:
+            start = time.perf_counter()
+            try:
+                response = await client.get(url + path, timeout=timeout)
+            except httpx.TransportError:
+                healthy = False
+            else:
+                healthy = response.status_code < SERVER_ERROR_STATUS
+            if healthy:
+                self.record_success(url, time.perf_counter() - start)
+            else:
+                self.record_failure(url)
+            return healthy
+
+        outcomes = await asyncio.gather(*(probe(url) for url in urls))
+        return dict(zip(urls, outcomes, strict=True))
@@ -0,0 +1,25 @@
+"""Shared fixtures for the test suite."""
+
+from collections.abc import Callable
+
+import httpx
+import pytest
+
+AsyncClient = httpx.AsyncClient
+Handler = Callable[[httpx.Request], httpx.Response]
+
+
+@pytest.fixture
+def mock_http(monkeypatch) -> Callable[[Handler], None]:
+    """Route every AsyncClient the caller opens through a mock transport.
+
+    Call the fixture with a request handler; the patch lasts until the test ends.
+    """
+
+    def install(handler: Handler) -> None:
+        monkeypatch.setattr(
+            "api_client.caller.httpx.AsyncClient",
+            lambda *args, **kwargs: AsyncClient(transport=httpx.MockTransport(handler)),
+        )
+
+    return install
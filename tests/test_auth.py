@@ -0,0 +1,387 @@
+"""Tests for auth providers, run against a local stand-in token server."""
+
+import asyncio
+import base64
+import io
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Self
+from urllib.parse import parse_qs, urlparse
+
+import httpx
+import pytest
+
+from api_client.auth import (
+    AccessToken,
+    APIKeyAuth,
+    AuthError,
+    AuthProvider,
+    BasicAuth,
+    BearerAuth,
+    OAuth2ClientCredentials,
+    provider_for_scheme,
+)
+from api_client.caller import APICaller, APIRequest
+from api_client.models import ParameterDef, SchemaNode, SecuritySchemeDef, ToolDefinition
+
+CLIENT_ID = "client"
+CLIENT_SECRET = "s3cret"
+
+
+class _Server(ThreadingHTTPServer):
+    request_queue_size = 64
+
+
+class StandInServer:
+    """Local OAuth2 token endpoint plus a protected ``/api/me`` resource."""
+
+    def __init__(self) -> None:
+        self.token_requests: list[dict[str, list[str]]] = []
+        self.api_requests: list[str] = []
+        self.expires_in = 3600
+        self.token_delay = 0.0
+        self.token_status = 200
+        self.valid_tokens: set[str] = set()
+        self._lock = threading.Lock()
+        self.httpd = _Server(("127.0.0.1", 0), self._handler())
+        self.url = f"http://127.0.0.1:{self.httpd.server_port}"
+        self._thread = threading.Thread(
+            target=self.httpd.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True
+        )
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args: object) -> None:
+                pass
+
+            def _reply(self, status: int, payload: dict) -> None:
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self) -> None:
+                length = int(self.headers.get("Content-Length", 0))
+                form = parse_qs(self.rfile.read(length).decode())
+                expected = base64.b64encode(f"{CLIENT_ID}:{CLIENT_SECRET}".encode()).decode()
+                if self.headers.get("Authorization") != f"Basic {expected}":
+                    self._reply(401, {"error": "invalid_client"})
+                    return
+                time.sleep(server.token_delay)
+                with server._lock:
+                    server.token_requests.append(form)
+                    token = f"token-{len(server.token_requests)}"
+                    server.valid_tokens.add(token)
+                if server.token_status != 200:
+                    self._reply(server.token_status, {"error": "server_error"})
+                    return
+                self._reply(
+                    200,
+                    {
+                        "access_token": token,
+                        "token_type": "Bearer",
+                        "expires_in": server.expires_in,
+                    },
+                )
+
+            def do_GET(self) -> None:
+                header = self.headers.get("Authorization", "")
+                token = header.removeprefix("Bearer ")
+                with server._lock:
+                    server.api_requests.append(token)
+                    valid = token in server.valid_tokens
+                if not valid:
+                    self._reply(401, {"error": "invalid_token"})
+                    return
+                query = parse_qs(urlparse(self.path).query)
+                self._reply(200, {"token": token, "query": query})
+
+        return Handler
+
+    def __enter__(self) -> Self:
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def server():
+    with StandInServer() as stand_in:
+        yield stand_in
+
+
+def oauth(server: StandInServer, **kwargs) -> OAuth2ClientCredentials:
+    return OAuth2ClientCredentials(f"{server.url}/token", CLIENT_ID, CLIENT_SECRET, **kwargs)
+
+
+def me_tool(server: StandInServer, security=None) -> ToolDefinition:
+    return ToolDefinition(
+        name="me",
+        description="Current user",
+        method="GET",
+        path="/api/me",
+        base_url=server.url,
+        security=[{"oauth": ["read"]}] if security is None else security,
+    )
+
+
+class TestStaticProviders:
+    @pytest.mark.asyncio
+    async def test_api_key_locations(self):
+        request = APIRequest(method="GET", url="/x")
+        await APIKeyAuth("k1", "X-API-Key").apply(request)
+        await APIKeyAuth("k2", "api_key", "query").apply(request)
+        await APIKeyAuth("k3", "session", "cookie").apply(request)
+        await APIKeyAuth("k4", "other", "cookie").apply(request)
+        assert request.headers["X-API-Key"] == "k1"
+        assert request.query_params == {"api_key": "k2"}
+        assert request.headers["Cookie"] == "session=k3; other=k4"
+
+    def test_api_key_rejects_unknown_location(self):
+        with pytest.raises(ValueError):
+            APIKeyAuth("k", "n", "body")
+
+    @pytest.mark.asyncio
+    async def test_bearer_and_basic(self):
+        request = APIRequest(method="GET", url="/x")
+        await BearerAuth("abc").apply(request)
+        assert request.headers["Authorization"] == "Bearer abc"
+        await BasicAuth("user", "pass").apply(request)
+        assert request.headers["Authorization"] == "Basic dXNlcjpwYXNz"
+        assert BasicAuth("u", "p").invalidate(request) is False
+
+    def test_auth_provider_is_abstract(self):
+        with pytest.raises(TypeError):
+            AuthProvider()
+
+    def test_provider_for_scheme(self):
+        key = provider_for_scheme(
+            SecuritySchemeDef(name="key", type="apiKey", location="query", param_name="k"),
+            key="abc",
+        )
+        assert isinstance(key, APIKeyAuth)
+        assert key.location == "query"
+        oauth2 = provider_for_scheme(
+            SecuritySchemeDef(name="o", type="oauth2", token_url="https://t/token"),
+            client_id="id",
+            client_secret="secret",
+        )
+        assert isinstance(oauth2, OAuth2ClientCredentials)
+        with pytest.raises(ValueError):
+            provider_for_scheme(SecuritySchemeDef(name="oidc", type="openIdConnect"))
+
+
+class TestOAuth2ClientCredentials:
+    @pytest.mark.asyncio
+    async def test_token_cached(self, server):
+        provider = oauth(server)
+        first = await provider.get_token(("read",))
+        second = await provider.get_token(("read",))
+        assert first is second
+        assert len(server.token_requests) == 1
+        assert server.token_requests[0]["grant_type"] == ["client_credentials"]
+        assert server.token_requests[0]["scope"] == ["read"]
+
+    @pytest.mark.asyncio
+    async def test_scope_sets_cached_separately(self, server):
+        provider = oauth(server, scopes=("base",))
+        await provider.get_token(("read",))
+        await provider.get_token(("write",))
+        assert [r["scope"] for r in server.token_requests] == [["base read"], ["base write"]]
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_single_flight(self, server):
+        server.token_delay = 0.1
+        provider = oauth(server)
+        tokens = await asyncio.gather(*(provider.get_token() for _ in range(20)))
+        assert len({token.value for token in tokens}) == 1
+        assert len(server.token_requests) == 1
+
+    @pytest.mark.asyncio
+    async def test_refreshes_in_background_before_expiry(self, server):
+        provider = oauth(server)
+        now = time.monotonic()
+        stale = AccessToken("stale", expires_at=now + 30, refresh_at=now - 1)
+        provider._tokens[frozenset()] = stale
+        assert await provider.get_token() is stale
+        await asyncio.wait_for(asyncio.gather(*provider._inflight.values()), 5)
+        refreshed = await provider.get_token()
+        assert refreshed.value == "token-1"
+        assert len(server.token_requests) == 1
+
+    @pytest.mark.asyncio
+    async def test_refresh_margin_clamped_for_short_lived_tokens(self, server):
+        server.expires_in = 30
+        provider = oauth(server, refresh_margin=60)
+        token = await provider.get_token()
+        assert token.expires_at - token.refresh_at == pytest.approx(15)
+        for _ in range(50):
+            await provider.get_token()
+        assert len(server.token_requests) == 1
+
+    @pytest.mark.asyncio
+    async def test_expired_token_refetched(self, server):
+        server.expires_in = 0
+        provider = oauth(server, refresh_margin=0)
+        first = await provider.get_token()
+        second = await provider.get_token()
+        assert first.value != second.value
+
+    @pytest.mark.asyncio
+    async def test_token_endpoint_error(self, server):
+        server.token_status = 500
+        with pytest.raises(AuthError):
+            await oauth(server).get_token()
+
+    @pytest.mark.asyncio
+    async def test_unreachable_token_endpoint(self):
+        provider = OAuth2ClientCredentials("http://127.0.0.1:1/token", "a", "b", timeout=1)
+        with pytest.raises(AuthError):
+            await provider.get_token()
+
+    @pytest.mark.asyncio
+    async def test_aclose_cancels_refresh(self, server):
+        server.token_delay = 0.5
+        provider = oauth(server)
+        provider._refresh(frozenset())
+        await provider.aclose()
+        assert all(task.done() for task in provider._inflight.values())
+
+
+class TestCallerAuth:
+    @pytest.mark.asyncio
+    async def test_call_sends_bearer_token(self, server):
+        caller = APICaller(auth={"oauth": oauth(server)})
+        result = await caller.call(me_tool(server), {})
+        assert result.status_code == 200
+        assert result.body["token"] == "token-1"
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_fetch_one_token(self, server):
+        server.token_delay = 0.05
+        caller = APICaller(auth={"oauth": oauth(server)})
+        results = await asyncio.gather(*(caller.call(me_tool(server), {}) for _ in range(10)))
+        assert {r.status_code for r in results} == {200}
+        assert len(server.token_requests) == 1
+
+    @pytest.mark.asyncio
+    async def test_rejected_token_refreshed_once(self, server):
+        caller = APICaller(auth={"oauth": oauth(server)})
+        await caller.call(me_tool(server), {})
+        server.valid_tokens.clear()
+        results = await asyncio.gather(*(caller.call(me_tool(server), {}) for _ in range(5)))
+        assert {r.status_code for r in results} == {200}
+        assert {r.body["token"] for r in results} == {"token-2"}
+        assert len(server.token_requests) == 2
+
+    @pytest.mark.asyncio
+    async def test_static_credentials_not_retried(self, server):
+        caller = APICaller(auth={"bearer": BearerAuth("nope")})
+        result = await caller.call(me_tool(server, [{"bearer": []}]), {})
+        assert result.status_code == 401
+        assert server.api_requests == ["nope"]
+
+    @pytest.mark.asyncio
+    async def test_first_satisfiable_requirement_used(self, server):
+        server.valid_tokens.add("")
+        caller = APICaller(auth={"key": APIKeyAuth("abc", "api_key", "query")})
+        tool = me_tool(server, [{"oauth": ["read"]}, {"key": []}])
+        result = await caller.call(tool, {})
+        assert result.body["query"] == {"api_key": ["abc"]}
+        assert server.token_requests == []
+
+    @pytest.mark.asyncio
+    async def test_unauthenticated_when_no_provider_matches(self, server):
+        result = await APICaller().call(me_tool(server), {})
+        assert result.status_code == 401
+
+    @pytest.mark.asyncio
+    async def test_uncovered_security_raises(self, server):
+        caller = APICaller(auth={"key": APIKeyAuth("abc", "api_key")})
+        with pytest.raises(AuthError, match="needs oauth"):
+            await caller.call(me_tool(server), {})
+        assert server.api_requests == []
+
+    @pytest.mark.asyncio
+    async def test_upload_rewound_before_retry_after_401(self, mock_http):
+        bodies: list[bytes] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            bodies.append(request.content)
+            status = 401 if request.headers["Authorization"] == "Bearer old" else 200
+            return httpx.Response(status, json={})
+
+        class RotatingToken(AuthProvider):
+            token = "old"
+
+            async def apply(self, request, scopes=()):
+                request.headers["Authorization"] = f"Bearer {self.token}"
+
+            def invalidate(self, request):
+                self.token = "new"
+                return True
+
+        body_schema = SchemaNode(type="string", format="binary")
+        tool = ToolDefinition(
+            name="put_blob",
+            description="Put blob",
+            method="PUT",
+            path="/blob",
+            base_url="https://api.example.com",
+            parameters=[
+                ParameterDef(
+                    name="body", type="string", required=True, location="body", schema=body_schema
+                )
+            ],
+            body_schema=body_schema,
+            content_types=["application/octet-stream"],
+            security=[{"token": []}],
+        )
+        caller = APICaller(auth={"token": RotatingToken()})
+        mock_http(handler)
+        result = await caller.call(tool, {"body": io.BytesIO(b"payload-data")})
+        assert result.status_code == 200
+        assert bodies == [b"payload-data", b"payload-data"]
+
+    @pytest.mark.asyncio
+    async def test_router_latency_excludes_auth_and_rejected_attempt(self, mock_http):
+        delay = 0.2
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.headers["Authorization"] == "Bearer old":
+                time.sleep(delay)
+                return httpx.Response(401)
+            return httpx.Response(200, json={})
+
+        class SlowRotatingToken(AuthProvider):
+            token = "old"
+
+            async def apply(self, request, scopes=()):
+                await asyncio.sleep(delay)
+                request.headers["Authorization"] = f"Bearer {self.token}"
+
+            def invalidate(self, request):
+                self.token = "new"
+                return True
+
+        tool = ToolDefinition(
+            name="get_me",
+            description="Get me",
+            method="GET",
+            path="/me",
+            base_url="https://api.example.com",
+            security=[{"token": []}],
+        )
+        caller = APICaller(auth={"token": SlowRotatingToken()})
+        mock_http(handler)
+        assert (await caller.call(tool, {})).status_code == 200
+        assert caller.router.stats["https://api.example.com"].ewma_latency < delay
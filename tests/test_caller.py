@@ -3,7 +3,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 import pytest
 
 from api_client.caller import APICaller, APIResponse
-from api_client.models import ParameterDef, ToolDefinition
+from api_client.models import ParameterDef, SchemaNode, ToolDefinition
 
 
 class TestAPICallerInit:
@@ -139,6 +139,54 @@ class TestBuildRequest:
         request = caller.build_request(tool, {})
         assert request.headers == {"Authorization": "Bearer abc"}
 
+    def test_nested_body_values_passed_through(self):
+        tool = ToolDefinition(
+            name="create_customer",
+            description="Create a customer",
+            method="POST",
+            path="/customers",
+            parameters=[
+                ParameterDef(name="address", type="object", required=True, location="body"),
+            ],
+        )
+        address = {"street": "Main", "geo": {"lat": 1.0, "lng": 2.0}}
+        request = self.caller.build_request(tool, {"address": address})
+        assert request.json_body == {"address": address}
+
+    def test_non_object_body_schema_sends_whole_payload(self):
+        body_schema = SchemaNode(type="array", items=SchemaNode(type="string"))
+        tool = ToolDefinition(
+            name="batch",
+            description="Batch",
+            method="POST",
+            path="/batch",
+            parameters=[
+                ParameterDef(
+                    name="body", type="array", required=True, location="body", schema=body_schema
+                ),
+            ],
+            body_schema=body_schema,
+        )
+        request = self.caller.build_request(tool, {"body": ["a", "b"]})
+        assert request.json_body == ["a", "b"]
+
+    def test_map_body_schema_sends_whole_payload(self):
+        body_schema = SchemaNode(type="object", additional_properties=SchemaNode(type="string"))
+        tool = ToolDefinition(
+            name="put_meta",
+            description="Put metadata",
+            method="PUT",
+            path="/meta",
+            parameters=[
+                ParameterDef(
+                    name="body", type="object", required=True, location="body", schema=body_schema
+                ),
+            ],
+            body_schema=body_schema,
+        )
+        request = self.caller.build_request(tool, {"body": {"team": "core", "env": "prod"}})
+        assert request.json_body == {"team": "core", "env": "prod"}
+
 
 class TestAPIResponse:
     def test_response_has_status_code(self):
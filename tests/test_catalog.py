@@ -0,0 +1,149 @@
+"""Tests for the memory-mapped tool catalog."""
+
+import multiprocessing
+
+import pytest
+
+from api_client.catalog import ToolCatalog, write_catalog
+from api_client.parser import OpenAPIParser
+from tests.test_parser import (
+    MAP_SPEC,
+    MULTI_SERVER_SPEC,
+    NESTED_SPEC,
+    PAGINATED_SPEC,
+    SAMPLE_SPEC,
+    UNTYPED_ENUM_SPEC,
+)
+
+
+def _lookup_in_child(path, name, queue):
+    with ToolCatalog.open(path) as catalog:
+        queue.put(catalog[name].path)
+
+
+@pytest.fixture
+def nested_catalog(tmp_path):
+    path = tmp_path / "nested.cat"
+    OpenAPIParser(NESTED_SPEC).export_catalog(path)
+    with ToolCatalog.open(path) as catalog:
+        yield catalog
+
+
+class TestWriteAndOpen:
+    def test_round_trip_matches_parsed_tools(self, tmp_path):
+        parser = OpenAPIParser(SAMPLE_SPEC)
+        path = tmp_path / "pets.cat"
+        tools = parser.export_catalog(path)
+        with ToolCatalog.open(path) as catalog:
+            assert len(catalog) == 3
+            for tool in tools:
+                assert catalog[tool.name] == tool
+
+    def test_names_sorted(self, tmp_path):
+        path = tmp_path / "pets.cat"
+        OpenAPIParser(SAMPLE_SPEC).export_catalog(path)
+        with ToolCatalog.open(path) as catalog:
+            assert list(catalog.names()) == ["createPet", "listPets", "showPetById"]
+
+    def test_servers_round_trip(self, tmp_path):
+        parser = OpenAPIParser(MULTI_SERVER_SPEC)
+        path = tmp_path / "regional.cat"
+        tools = {t.name: t for t in parser.export_catalog(path)}
+        with ToolCatalog.open(path) as catalog:
+            assert catalog["listItems"].servers == tools["listItems"].servers
+
+    def test_pagination_round_trip(self, tmp_path):
+        parser = OpenAPIParser(PAGINATED_SPEC)
+        path = tmp_path / "crm.cat"
+        tools = {t.name: t for t in parser.export_catalog(path)}
+        with ToolCatalog.open(path) as catalog:
+            assert catalog["listContacts"].pagination == tools["listContacts"].pagination
+            assert catalog["createContact"].pagination is None
+
+    def test_openai_export_round_trip(self, tmp_path):
+        parser = OpenAPIParser(SAMPLE_SPEC)
+        path = tmp_path / "pets.cat"
+        parser.export_catalog(path)
+        expected = {t["function"]["name"]: t for t in parser.to_openai_tools()}
+        with ToolCatalog.open(path) as catalog:
+            assert catalog.openai_tool("listPets") == expected["listPets"]
+            assert len(catalog.openai_tools()) == 3
+            raw = catalog.openai_tool_bytes("listPets")
+            assert isinstance(raw, memoryview)
+            assert raw.readonly
+            raw.release()
+
+    def test_mismatched_lengths_rejected(self, tmp_path):
+        tools = OpenAPIParser(SAMPLE_SPEC).parse()
+        with pytest.raises(ValueError):
+            write_catalog(tmp_path / "bad.cat", tools, [])
+
+    def test_rejects_non_catalog_file(self, tmp_path):
+        path = tmp_path / "junk.cat"
+        path.write_bytes(b"not a catalog at all, just some bytes")
+        with pytest.raises(ValueError):
+            ToolCatalog.open(path)
+
+    def test_rewrite_keeps_open_mapping_consistent(self, tmp_path):
+        path = tmp_path / "pets.cat"
+        OpenAPIParser(SAMPLE_SPEC).export_catalog(path)
+        with ToolCatalog.open(path) as old:
+            OpenAPIParser(NESTED_SPEC).export_catalog(path)
+            assert "listPets" in old
+            with ToolCatalog.open(path) as new:
+                assert "listPets" not in new
+                assert "createCustomer" in new
+
+
+class TestLazyAccess:
+    def test_tools_built_only_on_lookup(self, nested_catalog):
+        assert nested_catalog._tools == {}
+        assert "createCustomer" in nested_catalog
+        assert nested_catalog._tools == {}
+        tool = nested_catalog.get("createCustomer")
+        assert list(nested_catalog._tools) == ["createCustomer"]
+        assert nested_catalog.get("createCustomer") is tool
+
+    def test_unknown_tool(self, nested_catalog):
+        assert nested_catalog.get("missing") is None
+        assert "missing" not in nested_catalog
+        assert nested_catalog.openai_tool("missing") is None
+        with pytest.raises(KeyError):
+            nested_catalog["missing"]
+
+    def test_shared_schemas_rebuilt_as_shared_nodes(self, nested_catalog):
+        params = {p.name: p for p in nested_catalog["createCustomer"].parameters}
+        batch = nested_catalog["batchCreate"]
+        assert params["billing"].schema is params["shipping"].schema
+        assert batch.body_schema.items is params["billing"].schema
+
+    def test_additional_properties_round_trip(self, tmp_path):
+        path = tmp_path / "maps.cat"
+        tools = OpenAPIParser(MAP_SPEC).export_catalog(path)
+        with ToolCatalog.open(path) as catalog:
+            for tool in tools:
+                assert catalog[tool.name] == tool
+
+    def test_bool_and_int_enums_stored_separately(self, tmp_path):
+        path = tmp_path / "flags.cat"
+        OpenAPIParser(UNTYPED_ENUM_SPEC).export_catalog(path)
+        with ToolCatalog.open(path) as catalog:
+            params = {p.name: p for p in catalog["updateSettings"].parameters}
+            assert params["flag"].schema.enum == (True, False)
+            assert params["level"].schema.enum == (1, 0)
+
+    def test_iteration_yields_all_tools(self, nested_catalog):
+        assert {t.name for t in nested_catalog} == {"batchCreate", "createCustomer", "createTree"}
+
+
+class TestMultiProcess:
+    def test_child_process_reads_catalog(self, tmp_path):
+        path = tmp_path / "pets.cat"
+        OpenAPIParser(SAMPLE_SPEC).export_catalog(path)
+        context = multiprocessing.get_context("spawn")
+        queue = context.Queue()
+        child = context.Process(target=_lookup_in_child, args=(str(path), "showPetById", queue))
+        child.start()
+        child.join(timeout=30)
+        assert child.exitcode == 0
+        assert queue.get(timeout=5) == "/pets/{petId}"
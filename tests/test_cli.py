@@ -0,0 +1,168 @@
+"""Tests for the command-line interface."""
+
+import json
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from api_client.catalog import ToolCatalog
+from api_client.cli import main, percentile
+from tests.test_parser import SAMPLE_SPEC
+
+
+@pytest.fixture
+def spec_path(tmp_path):
+    path = tmp_path / "pets.json"
+    path.write_text(json.dumps(SAMPLE_SPEC))
+    return path
+
+
+@pytest.fixture
+def catalog_path(tmp_path, spec_path):
+    path = tmp_path / "pets.cat"
+    assert main(["compile", str(spec_path), "-o", str(path)]) == 0
+    return path
+
+
+class TestCompile:
+    def test_writes_catalog(self, tmp_path, spec_path, capsys):
+        path = tmp_path / "out.cat"
+        assert main(["compile", str(spec_path), "-o", str(path)]) == 0
+        assert "Compiled 3 tools" in capsys.readouterr().out
+        with ToolCatalog.open(path) as catalog:
+            assert set(catalog.names()) == {"listPets", "createPet", "showPetById"}
+
+    def test_writes_openai_tools(self, tmp_path, spec_path):
+        out = tmp_path / "tools.json"
+        args = ["compile", str(spec_path), "-o", str(tmp_path / "c.cat"), "--openai-out", str(out)]
+        assert main(args) == 0
+        tools = json.loads(out.read_text())
+        assert {tool["function"]["name"] for tool in tools} == {
+            "listPets",
+            "createPet",
+            "showPetById",
+        }
+
+    def test_missing_spec_fails(self, tmp_path, capsys):
+        assert main(["compile", str(tmp_path / "nope.json"), "-o", str(tmp_path / "c")]) == 1
+        assert "error:" in capsys.readouterr().err
+
+
+class TestInspect:
+    def test_spec_report(self, spec_path, capsys):
+        assert main(["inspect", str(spec_path), "--json"]) == 0
+        report = json.loads(capsys.readouterr().out)
+        assert report["tools"] == 3
+        assert report["methods"] == {"GET": 2, "POST": 1}
+        assert report["parameters"]["max_per_tool"] >= 1
+        assert set(report["timings_ms"]) == {"load_ms", "parse_ms", "openai_export_ms"}
+
+    def test_catalog_report_matches_spec(self, spec_path, catalog_path, capsys):
+        main(["inspect", str(spec_path), "--json"])
+        from_spec = json.loads(capsys.readouterr().out)
+        main(["inspect", str(catalog_path), "--json"])
+        from_catalog = json.loads(capsys.readouterr().out)
+        assert set(from_catalog["timings_ms"]) == {"open_ms", "materialize_ms"}
+        del from_spec["timings_ms"], from_catalog["timings_ms"]
+        assert from_catalog == from_spec
+
+    def test_text_report(self, spec_path, capsys):
+        assert main(["inspect", str(spec_path)]) == 0
+        out = capsys.readouterr().out
+        assert "Tools:          3" in out
+        assert "GET=2" in out
+
+
+class TestBench:
+    def test_reports_throughput_and_statuses(self, mock_http, catalog_path, capsys):
+        seen = []
+
+        def handler(request):
+            seen.append(request)
+            return httpx.Response(200, json=[])
+
+        argv = ["bench", str(catalog_path), "listPets", "-n", "20", "-c", "5", "--json"]
+        argv += ["--base-url", "http://mock.local/", "--args", '{"limit": 5}', "-H", "X-Run: 1"]
+        mock_http(handler)
+        assert main(argv) == 0
+        report = json.loads(capsys.readouterr().out)
+        assert report["requests"] == 20
+        assert report["status_codes"] == {"200": 20}
+        assert report["errors"] == {}
+        assert report["latency_ms"]["p50"] <= report["latency_ms"]["max"]
+        assert len(seen) == 20
+        assert str(seen[0].url) == "http://mock.local/pets?limit=5"
+        assert seen[0].headers["X-Run"] == "1"
+
+    def test_counts_errors(self, mock_http, spec_path, capsys):
+        def handler(request):
+            raise httpx.ConnectError("refused")
+
+        argv = ["bench", str(spec_path), "listPets", "-n", "3", "--base-url", "http://x"]
+        mock_http(handler)
+        assert main(argv) == 0
+        out = capsys.readouterr().out
+        assert "Errors:       ConnectError=3" in out
+        assert "(0.0 successful)" in out
+
+    def test_success_throughput_excludes_failures(self, mock_http, catalog_path, capsys):
+        def handler(request):
+            return httpx.Response(500, json=[])
+
+        argv = [
+            "bench",
+            str(catalog_path),
+            "listPets",
+            "-n",
+            "4",
+            "--base-url",
+            "http://x",
+            "--json",
+        ]
+        mock_http(handler)
+        assert main(argv) == 0
+        report = json.loads(capsys.readouterr().out)
+        assert report["successes"] == 0
+        assert report["success_rps"] == 0.0
+        assert report["throughput_rps"] > 0
+
+    def test_catalog_tool_looked_up_lazily(self, mock_http, catalog_path, capsys):
+        def handler(request):
+            return httpx.Response(200, json=[])
+
+        argv = ["bench", str(catalog_path), "listPets", "-n", "1", "--base-url", "http://x"]
+        mock_http(handler)
+        with patch.object(ToolCatalog, "__iter__", side_effect=AssertionError("full scan")):
+            assert main(argv) == 0
+
+    def test_unknown_tool(self, spec_path, capsys):
+        assert main(["bench", str(spec_path), "nope"]) == 1
+        assert "no tool named 'nope'" in capsys.readouterr().err
+
+    def test_rejects_header_without_colon(self, spec_path, capsys):
+        with pytest.raises(SystemExit):
+            main(["bench", str(spec_path), "listPets", "-H", "foo"])
+        assert "expected 'Name: value'" in capsys.readouterr().err
+
+    @pytest.mark.parametrize("value", ["[1]", '"x"', "{bad"])
+    def test_rejects_args_that_are_not_a_json_object(self, spec_path, capsys, value):
+        with pytest.raises(SystemExit) as exc_info:
+            main(["bench", str(spec_path), "listPets", "--args", value])
+        assert exc_info.value.code == 2
+        assert "--args" in capsys.readouterr().err
+
+    def test_rejects_zero_concurrency(self, spec_path):
+        with pytest.raises(SystemExit):
+            main(["bench", str(spec_path), "listPets", "-c", "0"])
+
+
+class TestPercentile:
+    def test_nearest_rank(self):
+        values = [float(v) for v in range(1, 101)]
+        assert percentile(values, 50) == 50.0
+        assert percentile(values, 99) == 99.0
+        assert percentile(values, 100) == 100.0
+
+    def test_empty(self):
+        assert percentile([], 50) == 0.0
@@ -0,0 +1,363 @@
+"""Tests for request body encoding."""
+
+import io
+from contextlib import ExitStack
+from pathlib import Path
+
+import httpx
+import pytest
+
+from api_client.caller import APICaller, APIRequest
+from api_client.encoding import (
+    CHUNK_SIZE,
+    BufferReader,
+    content_kind,
+    encode_body,
+    form_value,
+    iter_chunks,
+    mark_uploads,
+    rewind_uploads,
+)
+from api_client.models import ParameterDef, SchemaNode, ToolDefinition
+
+BINARY = SchemaNode(type="string", format="binary")
+
+
+def recording_handler(captured: list[httpx.Request]):
+    """Return a mock transport handler that records each request."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        captured.append(request)
+        return httpx.Response(200, json={"ok": True})
+
+    return handler
+
+
+def binary_tool() -> ToolDefinition:
+    return ToolDefinition(
+        name="put_blob",
+        description="Put blob",
+        method="PUT",
+        path="/blob",
+        base_url="https://api.example.com",
+        parameters=[
+            ParameterDef(name="body", type="string", required=True, location="body", schema=BINARY)
+        ],
+        body_schema=BINARY,
+        content_types=["application/octet-stream"],
+    )
+
+
+class TestContentKind:
+    @pytest.mark.parametrize(
+        ("content_type", "kind"),
+        [
+            ("application/json", "json"),
+            ("application/vnd.api+json; charset=utf-8", "json"),
+            ("", "json"),
+            ("application/x-www-form-urlencoded", "form"),
+            ("multipart/form-data", "multipart"),
+            ("text/plain", "text"),
+            ("application/xml", "text"),
+            ("application/atom+xml", "text"),
+            ("application/octet-stream", "binary"),
+            ("image/png", "binary"),
+        ],
+    )
+    def test_classification(self, content_type, kind):
+        assert content_kind(content_type) == kind
+
+
+class TestBufferReader:
+    def test_reads_memoryview_slices_without_copy(self):
+        data = bytearray(b"abcdef")
+        reader = BufferReader(data)
+        chunk = reader.read(4)
+        assert isinstance(chunk, memoryview)
+        assert chunk.obj is data
+        assert bytes(chunk) == b"abcd"
+        assert bytes(reader.read()) == b"ef"
+        assert bytes(reader.read()) == b""
+
+    def test_seek_and_tell(self):
+        reader = BufferReader(b"abcdef")
+        assert reader.seek(0, 2) == 6
+        assert reader.tell() == 6
+        reader.seek(2)
+        assert bytes(reader.read(2)) == b"cd"
+
+    @pytest.mark.asyncio
+    async def test_iter_chunks_splits_large_buffer(self):
+        reader = BufferReader(b"x" * (CHUNK_SIZE * 2 + 1))
+        sizes = [len(chunk) async for chunk in iter_chunks(reader)]
+        assert sizes == [CHUNK_SIZE, CHUNK_SIZE, 1]
+
+
+class TestUploadMarks:
+    def test_file_objects_marked_and_rewound(self):
+        source = io.BytesIO(b"abcdef")
+        source.seek(2)
+        marks = mark_uploads([source, "text", b"raw", Path("x"), 1])
+        assert marks == [(source, 2)]
+        source.read()
+        rewind_uploads(marks)
+        assert source.read() == b"cdef"
+
+    def test_unseekable_stream_cannot_be_marked(self):
+        class Pipe:
+            def read(self, size=-1):
+                return b""
+
+            def seekable(self):
+                return False
+
+        assert mark_uploads([Pipe()]) is None
+
+
+class TestEncodeBody:
+    def test_json_body(self):
+        request = APIRequest(method="POST", url="/x", json_body={"a": 1})
+        with ExitStack() as stack:
+            assert encode_body(request, stack) == ({"json": {"a": 1}}, {})
+
+    @pytest.mark.asyncio
+    async def test_binary_path_streamed_with_length(self, tmp_path):
+        path = tmp_path / "blob.bin"
+        path.write_bytes(b"0123456789")
+        request = APIRequest(
+            method="PUT", url="/x", content_type="application/octet-stream", content=path
+        )
+        with ExitStack() as stack:
+            kwargs, headers = encode_body(request, stack)
+            chunks = [chunk async for chunk in kwargs["content"]]
+        assert headers == {"Content-Length": "10"}
+        assert b"".join(chunks) == b"0123456789"
+
+    @pytest.mark.asyncio
+    async def test_string_body_sent_as_text_not_opened_as_path(self, tmp_path):
+        path = tmp_path / "secret.txt"
+        path.write_bytes(b"secret")
+        request = APIRequest(method="PUT", url="/x", content_type="text/plain", content=str(path))
+        with ExitStack() as stack:
+            kwargs, headers = encode_body(request, stack)
+            chunks = [bytes(chunk) async for chunk in kwargs["content"]]
+        assert b"".join(chunks) == str(path).encode()
+        assert headers == {"Content-Length": str(len(str(path).encode()))}
+
+    @pytest.mark.asyncio
+    async def test_seekable_stream_sized_without_fileno(self):
+        source = io.BytesIO(b"header|payload")
+        source.seek(len(b"header|"))
+        request = APIRequest(
+            method="PUT", url="/x", content_type="application/octet-stream", content=source
+        )
+        with ExitStack() as stack:
+            kwargs, headers = encode_body(request, stack)
+            chunks = [chunk async for chunk in kwargs["content"]]
+        assert headers == {"Content-Length": "7"}
+        assert b"".join(chunks) == b"payload"
+
+    def test_form_scalar_lists_pass_through(self):
+        assert form_value(["a", "b"]) == ["a", "b"]
+        assert form_value({"k": 1}) == '{"k": 1}'
+        assert form_value([{"k": 1}]) == '[{"k": 1}]'
+
+    def test_unsupported_upload_type_rejected(self):
+        request = APIRequest(
+            method="PUT", url="/x", content_type="application/octet-stream", content=42
+        )
+        with ExitStack() as stack, pytest.raises(ValueError, match="Cannot upload a int"):
+            encode_body(request, stack)
+
+
+class TestBuildRequestContentTypes:
+    def setup_method(self):
+        self.caller = APICaller()
+
+    def test_defaults_to_tool_primary_content_type(self):
+        tool = ToolDefinition(
+            name="login",
+            description="Login",
+            method="POST",
+            path="/login",
+            parameters=[ParameterDef(name="user", type="string", required=True, location="body")],
+            content_types=["application/x-www-form-urlencoded"],
+        )
+        request = self.caller.build_request(tool, {"user": "alice"})
+        assert request.content_type == "application/x-www-form-urlencoded"
+        assert request.form_data == {"user": "alice"}
+        assert request.json_body is None
+
+    def test_multipart_splits_files_and_fields(self):
+        tool = ToolDefinition(
+            name="upload",
+            description="Upload",
+            method="POST",
+            path="/files",
+            parameters=[
+                ParameterDef(
+                    name="file", type="string", required=True, location="body", schema=BINARY
+                ),
+                ParameterDef(name="meta", type="object", required=False, location="body"),
+            ],
+            content_types=["multipart/form-data"],
+        )
+        request = self.caller.build_request(tool, {"file": "/tmp/a.csv", "meta": {"k": 1}})
+        assert request.files == {"file": "/tmp/a.csv"}
+        assert request.form_data == {"meta": '{"k": 1}'}
+
+    def test_structured_text_body_rejected(self):
+        tool = ToolDefinition(
+            name="createXml",
+            description="Create XML",
+            method="POST",
+            path="/items",
+            parameters=[ParameterDef(name="a", type="string", required=True, location="body")],
+            body_schema=SchemaNode(type="object", properties=(("a", SchemaNode(type="string")),)),
+            content_types=["application/xml"],
+        )
+        with pytest.raises(ValueError, match="cannot encode a structured body as application/xml"):
+            self.caller.build_request(tool, {"a": "x"})
+
+    def test_explicit_content_type_overrides_default(self):
+        tool = ToolDefinition(
+            name="create",
+            description="Create",
+            method="POST",
+            path="/items",
+            parameters=[ParameterDef(name="name", type="string", required=True, location="body")],
+            content_types=["application/json", "application/x-www-form-urlencoded"],
+        )
+        request = self.caller.build_request(
+            tool, {"name": "a"}, content_type="application/x-www-form-urlencoded"
+        )
+        assert request.form_data == {"name": "a"}
+
+
+class TestCallEncoding:
+    @pytest.mark.asyncio
+    async def test_form_body_sent_urlencoded(self, mock_http):
+        captured: list[httpx.Request] = []
+        tool = ToolDefinition(
+            name="login",
+            description="Login",
+            method="POST",
+            path="/login",
+            base_url="https://api.example.com",
+            parameters=[ParameterDef(name="user", type="string", required=True, location="body")],
+            content_types=["application/x-www-form-urlencoded"],
+        )
+        mock_http(recording_handler(captured))
+        await APICaller().call(tool, {"user": "alice"})
+        assert captured[0].headers["content-type"] == "application/x-www-form-urlencoded"
+        assert captured[0].content == b"user=alice"
+
+    @pytest.mark.asyncio
+    async def test_form_list_sent_as_repeated_keys(self, mock_http):
+        captured: list[httpx.Request] = []
+        tool = ToolDefinition(
+            name="tag",
+            description="Tag",
+            method="POST",
+            path="/tags",
+            base_url="https://api.example.com",
+            parameters=[ParameterDef(name="tags", type="array", required=True, location="body")],
+            content_types=["application/x-www-form-urlencoded"],
+        )
+        mock_http(recording_handler(captured))
+        await APICaller().call(tool, {"tags": ["a", "b"]})
+        assert captured[0].content == b"tags=a&tags=b"
+
+    @pytest.mark.asyncio
+    async def test_binary_bytesio_not_chunked(self, mock_http):
+        captured: list[httpx.Request] = []
+        mock_http(recording_handler(captured))
+        await APICaller().call(binary_tool(), {"body": io.BytesIO(b"payload-data")})
+        assert captured[0].headers["content-length"] == "12"
+        assert "transfer-encoding" not in captured[0].headers
+        assert captured[0].content == b"payload-data"
+
+    @pytest.mark.asyncio
+    async def test_multipart_streams_file_from_path(self, mock_http, tmp_path):
+        path = tmp_path / "report.csv"
+        path.write_bytes(b"a,b\n1,2\n")
+        captured: list[httpx.Request] = []
+        tool = ToolDefinition(
+            name="upload",
+            description="Upload",
+            method="POST",
+            path="/files",
+            base_url="https://api.example.com",
+            parameters=[
+                ParameterDef(
+                    name="file", type="string", required=True, location="body", schema=BINARY
+                ),
+                ParameterDef(name="title", type="string", required=False, location="body"),
+            ],
+            content_types=["multipart/form-data"],
+        )
+        mock_http(recording_handler(captured))
+        await APICaller().call(tool, {"file": path, "title": "Q3"})
+        sent = captured[0]
+        assert sent.headers["content-type"].startswith("multipart/form-data; boundary=")
+        assert b'filename="report.csv"' in sent.content
+        assert b"a,b\n1,2\n" in sent.content
+        assert b'name="title"\r\n\r\nQ3' in sent.content
+
+    @pytest.mark.asyncio
+    async def test_binary_streams_memoryview(self, mock_http):
+        payload = memoryview(b"\x00\x01" * CHUNK_SIZE)
+        captured: list[httpx.Request] = []
+        mock_http(recording_handler(captured))
+        await APICaller().call(binary_tool(), {"body": payload})
+        sent = captured[0]
+        assert sent.headers["content-type"] == "application/octet-stream"
+        assert sent.headers["content-length"] == str(len(payload))
+        assert "transfer-encoding" not in sent.headers
+        assert sent.content == payload.tobytes()
+
+    @pytest.mark.asyncio
+    async def test_text_body_string_is_content_not_path(self, mock_http):
+        body_schema = SchemaNode(type="string")
+        captured: list[httpx.Request] = []
+        tool = ToolDefinition(
+            name="put_note",
+            description="Put note",
+            method="PUT",
+            path="/note",
+            base_url="https://api.example.com",
+            parameters=[
+                ParameterDef(
+                    name="body", type="string", required=True, location="body", schema=body_schema
+                )
+            ],
+            body_schema=body_schema,
+            content_types=["text/plain"],
+        )
+        mock_http(recording_handler(captured))
+        await APICaller().call(tool, {"body": "/etc/hostname"})
+        await APICaller().call(tool, {"body": "hello world"})
+        assert captured[0].content == b"/etc/hostname"
+        assert captured[1].content == b"hello world"
+        assert captured[1].headers["content-type"] == "text/plain"
+
+    @pytest.mark.asyncio
+    async def test_multipart_binary_field_string_sent_as_content(self, mock_http):
+        captured: list[httpx.Request] = []
+        tool = ToolDefinition(
+            name="upload",
+            description="Upload",
+            method="POST",
+            path="/files",
+            base_url="https://api.example.com",
+            parameters=[
+                ParameterDef(
+                    name="file", type="string", required=True, location="body", schema=BINARY
+                )
+            ],
+            content_types=["multipart/form-data"],
+        )
+        mock_http(recording_handler(captured))
+        await APICaller().call(tool, {"file": "/etc/hostname"})
+        assert b'filename="file"' in captured[0].content
+        assert b"\r\n\r\n/etc/hostname\r\n" in captured[0].content
@@ -1,6 +1,6 @@
 """Tests for data models."""
 
-from api_client.models import ParameterDef, ToolDefinition
+from api_client.models import ParameterDef, SchemaNode, ToolDefinition, intern_schema
 
 
 class TestParameterDef:
@@ -96,3 +96,82 @@ class TestToolDefinition:
             name="createPet", description="Create pet", method="POST", path="/pets"
         )
         assert tool_a != tool_b
+
+
+class TestSchemaNode:
+    def test_equal_nodes_are_hashable_and_equal(self):
+        a = SchemaNode(type="string", enum=("a", "b"))
+        b = SchemaNode(type="string", enum=("a", "b"))
+        assert a == b
+        assert hash(a) == hash(b)
+
+    def test_intern_returns_canonical_instance(self):
+        a = intern_schema(SchemaNode(type="integer", format="int64"))
+        b = intern_schema(SchemaNode(type="integer", format="int64"))
+        assert a is b
+
+    def test_enum_equality_is_type_aware(self):
+        ints = SchemaNode(enum=(1, 0))
+        bools = SchemaNode(enum=(True, False))
+        assert ints != bools
+        assert intern_schema(ints).enum == (1, 0)
+        assert intern_schema(bools).enum == (True, False)
+
+    def test_additional_properties_rendered_and_compared(self):
+        values = SchemaNode(type="string")
+        node = SchemaNode(type="object", additional_properties=values)
+        assert node.to_json_schema() == {
+            "type": "object",
+            "additionalProperties": {"type": "string"},
+        }
+        assert node != SchemaNode(type="object", additional_properties=True)
+        assert SchemaNode(additional_properties=False).to_json_schema() == {
+            "additionalProperties": False
+        }
+
+    def test_intern_tolerates_unhashable_enum(self):
+        node = SchemaNode(type="object", enum=({"a": 1},))
+        assert intern_schema(node) is node
+
+    def test_is_object(self):
+        assert SchemaNode(type="object").is_object
+        assert SchemaNode(properties=(("x", SchemaNode(type="string")),)).is_object
+        assert not SchemaNode(type="array").is_object
+
+    def test_get_property(self):
+        street = SchemaNode(type="string")
+        node = SchemaNode(type="object", properties=(("street", street),))
+        assert node.get_property("street") is street
+        assert node.get_property("city") is None
+
+    def test_to_json_schema_nested(self):
+        node = SchemaNode(
+            type="object",
+            properties=(
+                ("tags", SchemaNode(type="array", items=SchemaNode(type="string"))),
+                ("kind", SchemaNode(type="string", enum=("a", "b"))),
+            ),
+            required=("kind",),
+        )
+        assert node.to_json_schema() == {
+            "type": "object",
+            "properties": {
+                "tags": {"type": "array", "items": {"type": "string"}},
+                "kind": {"type": "string", "enum": ["a", "b"]},
+            },
+            "required": ["kind"],
+        }
+
+    def test_to_json_schema_composition(self):
+        node = SchemaNode(one_of=(SchemaNode(type="string"), SchemaNode(type="integer")))
+        assert node.to_json_schema() == {"oneOf": [{"type": "string"}, {"type": "integer"}]}
+
+
+class TestParameterDefSchema:
+    def test_default_schema_is_none(self):
+        param = ParameterDef(name="limit", type="integer", required=False, location="query")
+        assert param.schema is None
+
+    def test_tool_default_body_schema_is_none(self):
+        tool = ToolDefinition(name="a", description="a", method="GET", path="/a")
+        assert tool.body_schema is None
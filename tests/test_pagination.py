@@ -0,0 +1,315 @@
+"""Tests for pagination detection and paginated tool execution."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from api_client.auth import BearerAuth
+from api_client.caller import APICaller
+from api_client.models import PaginationDef, ParameterDef, SchemaNode, ServerDef, ToolDefinition
+from api_client.pagination import detect_pagination, extract_items, next_link, next_page, origin
+
+BASE = "https://api.example.com"
+
+
+def query(*names: str) -> list[ParameterDef]:
+    return [ParameterDef(name=n, type="string", required=False, location="query") for n in names]
+
+
+def list_tool(pagination: PaginationDef, *params: str) -> ToolDefinition:
+    return ToolDefinition(
+        name="list_items",
+        description="List items",
+        method="GET",
+        path="/items",
+        base_url=BASE,
+        parameters=query(*params),
+        pagination=pagination,
+    )
+
+
+def cursor_handler(pages: int, per_page: int = 2):
+    """Serve ``pages`` pages of items addressed by a numeric cursor."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        index = int(request.url.params.get("cursor", "0"))
+        items = [index * per_page + n for n in range(per_page)]
+        next_cursor = str(index + 1) if index + 1 < pages else None
+        return httpx.Response(200, json={"data": items, "meta": {"next_cursor": next_cursor}})
+
+    return handler
+
+
+CURSOR = PaginationDef(
+    style="cursor", param="cursor", next_field="meta.next_cursor", items_field="data"
+)
+
+
+class TestDetectPagination:
+    def test_cursor_with_nested_next_field(self):
+        schema = SchemaNode(
+            type="object",
+            properties=(
+                ("data", SchemaNode(type="array")),
+                (
+                    "meta",
+                    SchemaNode(type="object", properties=(("next_cursor", SchemaNode()),)),
+                ),
+            ),
+        )
+        detected = detect_pagination(query("cursor", "limit"), schema)
+        assert detected == PaginationDef(
+            style="cursor",
+            param="cursor",
+            limit_param="limit",
+            next_field="meta.next_cursor",
+            items_field="data",
+        )
+
+    def test_page_number(self):
+        detected = detect_pagination(query("page", "per_page"))
+        assert detected == PaginationDef(style="page", param="page", limit_param="per_page")
+
+    def test_offset(self):
+        detected = detect_pagination(query("offset", "limit"))
+        assert detected.style == "offset"
+
+    def test_single_array_property_is_items(self):
+        schema = SchemaNode(type="object", properties=(("pets", SchemaNode(type="array")),))
+        assert detect_pagination(query("page"), schema).items_field == "pets"
+
+    def test_link_header(self):
+        detected = detect_pagination([], None, frozenset({"link"}))
+        assert detected == PaginationDef(style="link")
+
+    def test_unpaginated(self):
+        assert detect_pagination(query("q")) is None
+
+    def test_extension_overrides(self):
+        detected = detect_pagination(
+            query("page"), extension={"style": "cursor", "param": "token", "next_field": "tok"}
+        )
+        assert detected == PaginationDef(style="cursor", param="token", next_field="tok")
+
+    def test_extension_rejects_unknown_style(self):
+        with pytest.raises(ValueError):
+            detect_pagination([], extension={"style": "magic"})
+
+
+class TestPageHelpers:
+    def test_extract_items(self):
+        assert extract_items({"data": [1, 2]}, CURSOR) == [1, 2]
+        assert extract_items([1], PaginationDef(style="page")) == [1]
+        assert extract_items({"data": None}, CURSOR) == []
+
+    def test_next_link(self):
+        header = '<https://x/items?page=1>; rel="prev", <https://x/items?page=3>; rel="next"'
+        assert next_link({"Link": header}) == "https://x/items?page=3"
+        assert next_link({}) is None
+
+    def test_next_page_number(self):
+        page = PaginationDef(style="page", param="page", limit_param="per_page")
+        assert next_page(page, {"per_page": 2}, [1, 2], {}, 2) == (
+            {"per_page": 2, "page": 2},
+            None,
+        )
+        assert next_page(page, {"per_page": 2, "page": 3}, [1], {}, 1) is None
+
+    def test_next_offset(self):
+        offset = PaginationDef(style="offset", param="offset")
+        assert next_page(offset, {"offset": 10}, [], {}, 5) == ({"offset": 15}, None)
+        assert next_page(offset, {"offset": 10}, [], {}, 0) is None
+
+    def test_cursor_absolute_url(self):
+        cursor = PaginationDef(style="cursor", param="cursor", next_field="next")
+        assert next_page(cursor, {}, {"next": "https://x/items?c=2"}, {}, 1) == (
+            {},
+            "https://x/items?c=2",
+        )
+
+    def test_relative_urls_resolved_against_response_url(self):
+        cursor = PaginationDef(style="cursor", param="cursor", next_field="next")
+        page_url = f"{BASE}/v1/items?c=1"
+        assert next_page(cursor, {}, {"next": "/v1/items?c=2"}, {}, 1, page_url) == (
+            {},
+            f"{BASE}/v1/items?c=2",
+        )
+        link = {"Link": '<items?page=2>; rel="next"'}
+        assert next_page(PaginationDef(style="link"), {}, [], link, 1, page_url) == (
+            {},
+            f"{BASE}/v1/items?page=2",
+        )
+
+    def test_origin_fills_default_ports(self):
+        assert origin("HTTPS://API.example.com/items") == ("https", "api.example.com", 443)
+        assert origin("https://api.example.com:443/") == origin(BASE)
+        assert origin("http://api.example.com") != origin(BASE)
+        assert origin("https://api.example.com:8443") != origin(BASE)
+
+    def test_repeated_cursor_stops(self):
+        assert next_page(CURSOR, {"cursor": "a"}, {"meta": {"next_cursor": "a"}}, {}, 1) is None
+
+
+class TestIterPages:
+    @pytest.mark.asyncio
+    async def test_walks_all_cursor_pages(self, mock_http):
+        tool = list_tool(CURSOR, "cursor")
+        mock_http(cursor_handler(3))
+        pages = [page async for page in APICaller().iter_pages(tool, {})]
+        assert [page.body["data"] for page in pages] == [[0, 1], [2, 3], [4, 5]]
+
+    @pytest.mark.asyncio
+    async def test_prefetches_next_page_while_consuming(self, mock_http):
+        requested: list[str] = []
+        serve = cursor_handler(2)
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requested.append(request.url.params.get("cursor", "0"))
+            return serve(request)
+
+        tool = list_tool(CURSOR, "cursor")
+        mock_http(handler)
+        pages = APICaller().iter_pages(tool, {})
+        await anext(pages)
+        await asyncio.sleep(0)
+        assert requested == ["0", "1"]
+        await pages.aclose()
+
+    @pytest.mark.asyncio
+    async def test_item_budget_stops_fetching(self, mock_http):
+        requested: list[str] = []
+        serve = cursor_handler(10)
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requested.append(request.url.params.get("cursor", "0"))
+            return serve(request)
+
+        tool = list_tool(CURSOR, "cursor")
+        mock_http(handler)
+        pages = [page async for page in APICaller().iter_pages(tool, {}, max_items=3)]
+        assert len(pages) == 2
+        assert requested == ["0", "1"]
+
+    @pytest.mark.asyncio
+    async def test_byte_budget_stops_fetching(self, mock_http):
+        tool = list_tool(CURSOR, "cursor")
+        mock_http(cursor_handler(10))
+        pages = [page async for page in APICaller().iter_pages(tool, {}, max_bytes=1)]
+        assert len(pages) == 1
+
+    @pytest.mark.asyncio
+    async def test_link_header_pagination(self, mock_http):
+        def handler(request: httpx.Request) -> httpx.Response:
+            page = int(request.url.params.get("page", "1"))
+            headers = {"Link": f'<{BASE}/items?page={page + 1}>; rel="next"'} if page < 3 else {}
+            return httpx.Response(200, json=[page], headers=headers)
+
+        tool = list_tool(PaginationDef(style="link"))
+        mock_http(handler)
+        pages = [page async for page in APICaller().iter_pages(tool, {})]
+        assert [page.body for page in pages] == [[1], [2], [3]]
+
+    @pytest.mark.asyncio
+    async def test_relative_link_header_pagination(self, mock_http):
+        def handler(request: httpx.Request) -> httpx.Response:
+            page = int(request.url.params.get("page", "1"))
+            headers = {"Link": f'</items?page={page + 1}>; rel="next"'} if page < 3 else {}
+            return httpx.Response(200, json=[page], headers=headers)
+
+        tool = list_tool(PaginationDef(style="link"))
+        mock_http(handler)
+        result = await APICaller().paginate(tool, {})
+        assert result.body == {"items": [1, 2, 3], "page_count": 3, "complete": True}
+
+    @pytest.mark.asyncio
+    async def test_cross_origin_link_is_not_followed(self, mock_http):
+        requests: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            headers = {"Link": '<https://evil.example.net/items?page=2>; rel="next"'}
+            return httpx.Response(200, json=[1], headers=headers)
+
+        tool = list_tool(PaginationDef(style="link"))
+        tool.security = [{"token": []}]
+        mock_http(handler)
+        result = await APICaller(auth={"token": BearerAuth("secret")}).paginate(tool, {})
+        assert [request.url.host for request in requests] == ["api.example.com"]
+        assert result.body == {"items": [1], "page_count": 1, "complete": False}
+
+    @pytest.mark.asyncio
+    async def test_link_to_another_server_records_its_stats(self, mock_http):
+        eu, us = "https://eu.example.com", "https://us.example.com"
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.host == "eu.example.com":
+                return httpx.Response(200, json=[1], headers={"Link": f'<{us}/items>; rel="next"'})
+            return httpx.Response(200, json=[2])
+
+        tool = list_tool(PaginationDef(style="link"))
+        tool.servers = [ServerDef(url=eu), ServerDef(url=us)]
+        caller = APICaller()
+        caller.router.record_success(us, 10.0)
+        mock_http(handler)
+        result = await caller.paginate(tool, {})
+        assert result.body["items"] == [1, 2]
+        assert caller.router.stats[eu].ewma_latency < 10.0
+        assert caller.router.stats[us].ewma_latency < 10.0
+
+    @pytest.mark.asyncio
+    async def test_error_page_ends_iteration(self, mock_http):
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.params.get("cursor"):
+                return httpx.Response(429, json={"error": "slow down"})
+            return httpx.Response(200, json={"data": [1], "meta": {"next_cursor": "1"}})
+
+        tool = list_tool(CURSOR, "cursor")
+        mock_http(handler)
+        pages = [page async for page in APICaller().iter_pages(tool, {})]
+        assert [page.status_code for page in pages] == [200, 429]
+
+
+class TestPaginate:
+    @pytest.mark.asyncio
+    async def test_aggregates_all_pages(self, mock_http):
+        tool = list_tool(CURSOR, "cursor")
+        mock_http(cursor_handler(3))
+        result = await APICaller().paginate(tool, {})
+        assert result.body == {"items": [0, 1, 2, 3, 4, 5], "page_count": 3, "complete": True}
+        assert result.status_code == 200
+
+    @pytest.mark.asyncio
+    async def test_truncates_to_item_budget(self, mock_http):
+        tool = list_tool(CURSOR, "cursor")
+        mock_http(cursor_handler(5))
+        result = await APICaller().paginate(tool, {}, max_items=3)
+        assert result.body == {"items": [0, 1, 2], "page_count": 2, "complete": False}
+
+    @pytest.mark.asyncio
+    async def test_page_number_until_short_page(self, mock_http):
+        def handler(request: httpx.Request) -> httpx.Response:
+            page = int(request.url.params["page"])
+            return httpx.Response(200, json=[page, page] if page < 3 else [page])
+
+        page = PaginationDef(style="page", param="page", limit_param="per_page")
+        tool = list_tool(page, "page", "per_page")
+        mock_http(handler)
+        result = await APICaller().paginate(tool, {"page": 1, "per_page": 2})
+        assert result.body["items"] == [1, 1, 2, 2, 3]
+        assert result.body["complete"] is True
+
+    @pytest.mark.asyncio
+    async def test_requires_pagination(self):
+        tool = ToolDefinition(name="a", description="a", method="GET", path="/a")
+        with pytest.raises(ValueError):
+            await APICaller().paginate(tool, {})
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("max_pages", [0, -1])
+    async def test_rejects_max_pages_below_one(self, max_pages):
+        tool = list_tool(CURSOR, "cursor")
+        with pytest.raises(ValueError, match="max_pages must be at least 1"):
+            await APICaller().paginate(tool, {}, max_pages=max_pages)
+        with pytest.raises(ValueError, match="max_pages must be at least 1"):
+            [page async for page in APICaller().iter_pages(tool, {}, max_pages=max_pages)]
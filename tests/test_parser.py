@@ -1,7 +1,9 @@
 """Tests for OpenAPI spec parser."""
 
-from api_client.models import ToolDefinition
-from api_client.parser import OpenAPIParser
+import pytest
+
+from api_client.models import SchemaNode, ToolDefinition
+from api_client.parser import OpenAPIParser, enum_type
 
 SAMPLE_SPEC = {
     "openapi": "3.0.0",
@@ -201,3 +203,513 @@ class TestEdgeCases:
         assert len(tools) == 1
         assert tools[0].name == "healthCheck"
         assert tools[0].parameters == []
+
+
+NESTED_SPEC = {
+    "openapi": "3.0.0",
+    "info": {"title": "Payments", "version": "1.0.0"},
+    "components": {
+        "schemas": {
+            "Address": {
+                "type": "object",
+                "properties": {"street": {"type": "string"}, "city": {"type": "string"}},
+                "required": ["street"],
+            },
+            "Base": {
+                "type": "object",
+                "properties": {"id": {"type": "string"}},
+                "required": ["id"],
+            },
+            "Node": {
+                "type": "object",
+                "properties": {
+                    "children": {"type": "array", "items": {"$ref": "#/components/schemas/Node"}}
+                },
+            },
+        }
+    },
+    "paths": {
+        "/customers": {
+            "post": {
+                "operationId": "createCustomer",
+                "summary": "Create a customer",
+                "requestBody": {
+                    "content": {
+                        "application/json": {
+                            "schema": {
+                                "allOf": [
+                                    {"$ref": "#/components/schemas/Base"},
+                                    {
+                                        "type": "object",
+                                        "properties": {
+                                            "billing": {"$ref": "#/components/schemas/Address"},
+                                            "shipping": {"$ref": "#/components/schemas/Address"},
+                                            "tier": {"type": "string", "enum": ["free", "pro"]},
+                                            "payment": {
+                                                "oneOf": [
+                                                    {"type": "string"},
+                                                    {"type": "integer"},
+                                                ]
+                                            },
+                                        },
+                                    },
+                                ]
+                            }
+                        }
+                    }
+                },
+            }
+        },
+        "/batch": {
+            "post": {
+                "operationId": "batchCreate",
+                "summary": "Batch create",
+                "requestBody": {
+                    "required": True,
+                    "content": {
+                        "application/json": {
+                            "schema": {
+                                "type": "array",
+                                "items": {"$ref": "#/components/schemas/Address"},
+                            }
+                        }
+                    },
+                },
+            }
+        },
+        "/tree": {
+            "post": {
+                "operationId": "createTree",
+                "summary": "Create a tree",
+                "requestBody": {
+                    "content": {
+                        "application/json": {"schema": {"$ref": "#/components/schemas/Node"}}
+                    }
+                },
+            }
+        },
+    },
+}
+
+
+UNTYPED_ENUM_SPEC = {
+    "openapi": "3.0.0",
+    "info": {"title": "Flags", "version": "1.0.0"},
+    "paths": {
+        "/settings": {
+            "post": {
+                "operationId": "updateSettings",
+                "requestBody": {
+                    "content": {
+                        "application/json": {
+                            "schema": {
+                                "type": "object",
+                                "properties": {
+                                    "flag": {"enum": [True, False]},
+                                    "level": {"enum": [1, 0]},
+                                    "mode": {"enum": ["a", 1]},
+                                },
+                            }
+                        }
+                    }
+                },
+                "responses": {"200": {"description": "OK"}},
+            }
+        }
+    },
+}
+
+
+MAP_SPEC = {
+    "openapi": "3.0.0",
+    "info": {"title": "Maps", "version": "1.0.0"},
+    "paths": {
+        "/meta": {
+            "put": {
+                "operationId": "putMeta",
+                "requestBody": {
+                    "required": True,
+                    "content": {
+                        "application/json": {
+                            "schema": {
+                                "type": "object",
+                                "additionalProperties": {"type": "string"},
+                            }
+                        }
+                    },
+                },
+                "responses": {"200": {"description": "OK"}},
+            }
+        },
+        "/payments": {
+            "post": {
+                "operationId": "createPayment",
+                "requestBody": {
+                    "content": {
+                        "application/json": {
+                            "schema": {
+                                "type": "object",
+                                "properties": {
+                                    "amount": {"type": "integer"},
+                                    "metadata": {
+                                        "type": "object",
+                                        "additionalProperties": {"type": "string"},
+                                    },
+                                },
+                            }
+                        }
+                    }
+                },
+                "responses": {"200": {"description": "OK"}},
+            }
+        },
+    },
+}
+
+
+class TestAdditionalProperties:
+    def setup_method(self):
+        self.parser = OpenAPIParser(MAP_SPEC)
+        self.tools = {t.name: t for t in self.parser.parse()}
+
+    def test_property_less_object_body_becomes_single_param(self):
+        tool = self.tools["putMeta"]
+        assert [(p.name, p.type, p.required) for p in tool.parameters] == [("body", "object", True)]
+        assert tool.body_schema.additional_properties == SchemaNode(type="string")
+
+    def test_nested_map_exported(self):
+        tools = {t["function"]["name"]: t for t in self.parser.to_openai_tools()}
+        props = tools["createPayment"]["function"]["parameters"]["properties"]
+        assert props["metadata"]["additionalProperties"] == {"type": "string"}
+
+
+class TestUntypedEnums:
+    def test_bool_and_int_enums_stay_distinct(self):
+        params = {p.name: p for p in OpenAPIParser(UNTYPED_ENUM_SPEC).parse()[0].parameters}
+        assert params["flag"].schema.enum == (True, False)
+        assert params["level"].schema.enum == (1, 0)
+
+    def test_type_inferred_from_enum_values(self):
+        tools = OpenAPIParser(UNTYPED_ENUM_SPEC).to_openai_tools()
+        props = tools[0]["function"]["parameters"]["properties"]
+        assert props["flag"]["type"] == "boolean"
+        assert props["flag"]["enum"] == [True, False]
+        assert props["level"]["type"] == "integer"
+        assert props["level"]["enum"] == [1, 0]
+        assert "type" not in props["mode"]
+
+    def test_enum_type(self):
+        assert enum_type([1, 2.5]) == "number"
+        assert enum_type(["a"]) == "string"
+        assert enum_type([None]) == ""
+
+
+class TestNestedSchemas:
+    def setup_method(self):
+        self.parser = OpenAPIParser(NESTED_SPEC)
+        self.tools = {t.name: t for t in self.parser.parse()}
+
+    def test_all_of_body_is_merged(self):
+        tool = self.tools["createCustomer"]
+        params = {p.name: p for p in tool.parameters}
+        assert set(params) == {"id", "billing", "shipping", "tier", "payment"}
+        assert params["id"].required is True
+        assert params["billing"].required is False
+
+    def test_nested_object_schema_kept(self):
+        billing = next(p for p in self.tools["createCustomer"].parameters if p.name == "billing")
+        assert billing.type == "object"
+        assert billing.schema.get_property("street").type == "string"
+        assert billing.schema.required == ("street",)
+
+    def test_repeated_sub_schemas_share_nodes(self):
+        params = {p.name: p for p in self.tools["createCustomer"].parameters}
+        batch_body = self.tools["batchCreate"].body_schema
+        assert params["billing"].schema is params["shipping"].schema
+        assert batch_body.items is params["billing"].schema
+
+    def test_non_object_body_becomes_single_param(self):
+        tool = self.tools["batchCreate"]
+        assert len(tool.parameters) == 1
+        body = tool.parameters[0]
+        assert body.name == "body"
+        assert body.type == "array"
+        assert body.required is True
+
+    def test_recursive_ref_terminates(self):
+        tool = self.tools["createTree"]
+        children = tool.body_schema.get_property("children")
+        assert children.type == "array"
+        assert children.items.type == "object"
+
+    def test_openai_export_includes_nested_schema(self):
+        exported = {t["function"]["name"]: t for t in self.parser.to_openai_tools()}
+        props = exported["createCustomer"]["function"]["parameters"]["properties"]
+        assert props["billing"]["properties"]["city"] == {"type": "string"}
+        assert props["tier"]["enum"] == ["free", "pro"]
+        assert "type" not in props["payment"]
+        assert props["payment"]["oneOf"] == [{"type": "string"}, {"type": "integer"}]
+
+    def test_unresolvable_ref_raises(self):
+        with pytest.raises(ValueError):
+            self.parser.build_schema({"$ref": "#/components/schemas/Missing"})
+
+
+CONTENT_TYPES_SPEC = {
+    "openapi": "3.0.0",
+    "info": {"title": "Files", "version": "1.0.0"},
+    "paths": {
+        "/files": {
+            "post": {
+                "operationId": "uploadFile",
+                "summary": "Upload a file",
+                "requestBody": {
+                    "content": {
+                        "multipart/form-data": {
+                            "schema": {
+                                "type": "object",
+                                "properties": {
+                                    "file": {"type": "string", "format": "binary"},
+                                    "title": {"type": "string"},
+                                },
+                                "required": ["file"],
+                            }
+                        },
+                        "application/json": {
+                            "schema": {
+                                "type": "object",
+                                "properties": {"url": {"type": "string"}},
+                            }
+                        },
+                    }
+                },
+            },
+            "put": {
+                "operationId": "putBlob",
+                "summary": "Put raw bytes",
+                "requestBody": {"content": {"application/octet-stream": {}}},
+            },
+            "patch": {
+                "operationId": "patchForm",
+                "summary": "Patch via form",
+                "requestBody": {
+                    "content": {
+                        "application/x-www-form-urlencoded": {
+                            "schema": {
+                                "type": "object",
+                                "properties": {"title": {"type": "string"}},
+                            }
+                        }
+                    }
+                },
+            },
+        },
+        "/notes": {
+            "post": {
+                "operationId": "postNote",
+                "summary": "Post a plain text note",
+                "requestBody": {"content": {"text/plain": {}}},
+            }
+        },
+    },
+}
+
+
+class TestContentTypes:
+    def setup_method(self):
+        self.tools = {t.name: t for t in OpenAPIParser(CONTENT_TYPES_SPEC).parse()}
+
+    def test_content_types_recorded_json_first(self):
+        assert self.tools["uploadFile"].content_types == [
+            "application/json",
+            "multipart/form-data",
+        ]
+
+    def test_non_json_body_modeled(self):
+        tool = self.tools["patchForm"]
+        assert tool.content_types == ["application/x-www-form-urlencoded"]
+        assert [p.name for p in tool.parameters] == ["title"]
+
+    def test_binary_body_without_schema(self):
+        tool = self.tools["putBlob"]
+        assert tool.content_types == ["application/octet-stream"]
+        assert tool.body_schema.format == "binary"
+        assert [p.name for p in tool.parameters] == ["body"]
+
+    def test_text_body_without_schema(self):
+        tool = self.tools["postNote"]
+        assert tool.body_schema == SchemaNode(type="string")
+        assert [p.name for p in tool.parameters] == ["body"]
+
+    def test_no_body_has_no_content_types(self):
+        tools = {t.name: t for t in OpenAPIParser(SAMPLE_SPEC).parse()}
+        assert tools["listPets"].content_types == []
+
+
+MULTI_SERVER_SPEC = {
+    "openapi": "3.0.0",
+    "info": {"title": "Regional", "version": "1.0.0"},
+    "servers": [
+        {
+            "url": "https://{region}.api.example.com/v1",
+            "description": "Regional endpoint",
+            "variables": {"region": {"default": "eu", "enum": ["eu", "us", "ap"]}},
+        },
+        {"url": "https://api.example.com/v1/"},
+    ],
+    "paths": {
+        "/items": {
+            "get": {"operationId": "listItems", "summary": "List items"},
+        },
+        "/uploads": {
+            "servers": [{"url": "https://uploads.example.com"}],
+            "post": {"operationId": "upload", "summary": "Upload"},
+        },
+    },
+}
+
+
+class TestServers:
+    def test_all_servers_kept_with_variables(self):
+        parser = OpenAPIParser(MULTI_SERVER_SPEC)
+        assert len(parser.servers) == 2
+        region = dict(parser.servers[0].variables)["region"]
+        assert region.default == "eu"
+        assert region.enum == ("eu", "us", "ap")
+        assert parser.servers[0].description == "Regional endpoint"
+
+    def test_base_url_resolves_first_server_defaults(self):
+        parser = OpenAPIParser(MULTI_SERVER_SPEC)
+        assert parser.base_url == "https://eu.api.example.com/v1"
+
+    def test_tools_carry_server_list(self):
+        tools = {t.name: t for t in OpenAPIParser(MULTI_SERVER_SPEC).parse()}
+        assert len(tools["listItems"].servers) == 2
+        assert tools["listItems"].servers[1].resolve() == "https://api.example.com/v1"
+
+    def test_path_level_servers_override(self):
+        tools = {t.name: t for t in OpenAPIParser(MULTI_SERVER_SPEC).parse()}
+        assert [s.url for s in tools["upload"].servers] == ["https://uploads.example.com"]
+        assert tools["upload"].base_url == "https://uploads.example.com"
+
+
+PAGINATED_SPEC = {
+    "openapi": "3.0.0",
+    "info": {"title": "CRM", "version": "1.0.0"},
+    "paths": {
+        "/contacts": {
+            "get": {
+                "operationId": "listContacts",
+                "summary": "List contacts",
+                "parameters": [
+                    {"name": "cursor", "in": "query", "schema": {"type": "string"}},
+                    {"name": "limit", "in": "query", "schema": {"type": "integer"}},
+                ],
+                "responses": {
+                    "200": {
+                        "description": "OK",
+                        "content": {
+                            "application/json": {
+                                "schema": {
+                                    "type": "object",
+                                    "properties": {
+                                        "results": {"type": "array", "items": {}},
+                                        "next_cursor": {"type": "string"},
+                                    },
+                                }
+                            }
+                        },
+                    }
+                },
+            },
+            "post": {
+                "operationId": "createContact",
+                "summary": "Create contact",
+                "parameters": [{"name": "page", "in": "query", "schema": {"type": "integer"}}],
+            },
+        },
+        "/events": {
+            "get": {
+                "operationId": "listEvents",
+                "summary": "List events",
+                "x-pagination": {"style": "page", "param": "p", "items_field": "events"},
+            }
+        },
+    },
+}
+
+
+class TestPaginationDetection:
+    def setup_method(self):
+        self.tools = {t.name: t for t in OpenAPIParser(PAGINATED_SPEC).parse()}
+
+    def test_cursor_pagination_detected(self):
+        pagination = self.tools["listContacts"].pagination
+        assert pagination.style == "cursor"
+        assert pagination.param == "cursor"
+        assert pagination.limit_param == "limit"
+        assert pagination.next_field == "next_cursor"
+        assert pagination.items_field == "results"
+
+    def test_non_get_not_paginated(self):
+        assert self.tools["createContact"].pagination is None
+
+    def test_extension_configures_pagination(self):
+        pagination = self.tools["listEvents"].pagination
+        assert (pagination.style, pagination.param, pagination.items_field) == (
+            "page",
+            "p",
+            "events",
+        )
+
+
+SECURED_SPEC = {
+    "openapi": "3.0.0",
+    "info": {"title": "Secured", "version": "1.0.0"},
+    "security": [{"oauth": ["read"]}],
+    "components": {
+        "securitySchemes": {
+            "oauth": {
+                "type": "oauth2",
+                "flows": {
+                    "clientCredentials": {
+                        "tokenUrl": "https://auth.example.com/token",
+                        "scopes": {"read": "Read access", "write": "Write access"},
+                    }
+                },
+            },
+            "apiKey": {"type": "apiKey", "in": "header", "name": "X-API-Key"},
+            "basic": {"type": "http", "scheme": "Basic"},
+        }
+    },
+    "paths": {
+        "/items": {
+            "get": {"operationId": "listItems", "summary": "List items"},
+            "post": {
+                "operationId": "createItem",
+                "summary": "Create item",
+                "security": [{"oauth": ["write"]}, {"apiKey": []}],
+            },
+        },
+        "/health": {"get": {"operationId": "health", "summary": "Health", "security": []}},
+    },
+}
+
+
+class TestSecurity:
+    def test_security_schemes_parsed(self):
+        schemes = OpenAPIParser(SECURED_SPEC).security_schemes
+        assert schemes["oauth"].type == "oauth2"
+        assert schemes["oauth"].token_url == "https://auth.example.com/token"
+        assert schemes["oauth"].scopes == ("read", "write")
+        assert (schemes["apiKey"].location, schemes["apiKey"].param_name) == (
+            "header",
+            "X-API-Key",
+        )
+        assert schemes["basic"].scheme == "basic"
+
+    def test_operation_security_requirements(self):
+        tools = {t.name: t for t in OpenAPIParser(SECURED_SPEC).parse()}
+        assert tools["listItems"].security == [{"oauth": ["read"]}]
+        assert tools["createItem"].security == [{"oauth": ["write"]}, {"apiKey": []}]
+        assert tools["health"].security == []
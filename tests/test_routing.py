@@ -0,0 +1,230 @@
+"""Tests for latency-aware server routing and failover."""
+
+import io
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from api_client.caller import APICaller
+from api_client.models import ParameterDef, SchemaNode, ServerDef, ServerVariable, ToolDefinition
+from api_client.routing import ServerRouter
+
+EU = "https://eu.example.com"
+US = "https://us.example.com"
+
+
+def regional_tool(method: str = "GET") -> ToolDefinition:
+    return ToolDefinition(
+        name="list_items",
+        description="List items",
+        method=method,
+        path="/items",
+        base_url=EU,
+        servers=[ServerDef(url=EU), ServerDef(url=US)],
+    )
+
+
+def regional_upload_tool() -> ToolDefinition:
+    body_schema = SchemaNode(type="string", format="binary")
+    return ToolDefinition(
+        name="put_blob",
+        description="Put blob",
+        method="PUT",
+        path="/blob",
+        base_url=EU,
+        parameters=[
+            ParameterDef(
+                name="body", type="string", required=True, location="body", schema=body_schema
+            )
+        ],
+        body_schema=body_schema,
+        content_types=["application/octet-stream"],
+        servers=[ServerDef(url=EU), ServerDef(url=US)],
+    )
+
+
+class UnseekableStream(io.RawIOBase):
+    def __init__(self, data: bytes) -> None:
+        self._data = io.BytesIO(data)
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        return self._data.readinto(buffer)
+
+
+class TestServerRouter:
+    def test_unmeasured_servers_keep_declaration_order(self):
+        router = ServerRouter()
+        assert router.rank([EU, US]) == [EU, US]
+
+    def test_ranks_by_ewma_latency(self):
+        router = ServerRouter()
+        router.record_success(EU, 0.200)
+        router.record_success(US, 0.050)
+        assert router.rank([EU, US]) == [US, EU]
+
+    def test_ewma_smooths_samples(self):
+        router = ServerRouter(alpha=0.5)
+        router.record_success(EU, 0.100)
+        router.record_success(EU, 0.300)
+        assert router.stats[EU].ewma_latency == pytest.approx(0.200)
+
+    def test_unmeasured_server_ranks_before_measured(self):
+        router = ServerRouter()
+        router.record_success(EU, 0.010)
+        assert router.rank([EU, US]) == [US, EU]
+
+    def test_failed_server_moves_to_back_until_cooldown_ends(self):
+        router = ServerRouter(cooldown=60.0)
+        router.record_failure(EU)
+        assert not router.is_healthy(EU)
+        assert router.rank([EU, US]) == [US, EU]
+        with patch("api_client.routing.time.monotonic", return_value=10**9):
+            assert router.is_healthy(EU)
+
+    def test_failure_threshold(self):
+        router = ServerRouter(failure_threshold=2)
+        router.record_failure(EU)
+        assert router.is_healthy(EU)
+        router.record_failure(EU)
+        assert not router.is_healthy(EU)
+
+    def test_success_clears_failures(self):
+        router = ServerRouter()
+        router.record_failure(EU)
+        router.record_success(EU, 0.1)
+        assert router.is_healthy(EU)
+        assert router.stats[EU].consecutive_failures == 0
+
+    @pytest.mark.asyncio
+    async def test_check_health(self):
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.host == "eu.example.com":
+                raise httpx.ConnectError("down", request=request)
+            return httpx.Response(200)
+
+        router = ServerRouter()
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            results = await router.check_health(client, [EU, US], "/health")
+        assert results == {EU: False, US: True}
+        assert not router.is_healthy(EU)
+        assert router.stats[US].ewma_latency is not None
+
+
+class TestServerResolution:
+    def test_server_variables_resolved_with_overrides(self):
+        server = ServerDef(
+            url="https://{region}.example.com/{version}/",
+            variables=(
+                ("region", ServerVariable(default="eu", enum=("eu", "us"))),
+                ("version", ServerVariable(default="v1")),
+            ),
+        )
+        assert server.resolve() == "https://eu.example.com/v1"
+        assert server.resolve({"region": "us"}) == "https://us.example.com/v1"
+        with pytest.raises(ValueError):
+            server.resolve({"region": "mars"})
+
+    def test_caller_server_urls(self):
+        caller = APICaller()
+        assert caller.server_urls(regional_tool()) == [EU, US]
+        bare = ToolDefinition(name="a", description="a", method="GET", path="/a", base_url=EU)
+        assert caller.server_urls(bare) == [EU]
+
+
+class TestFailover:
+    @pytest.mark.asyncio
+    async def test_connect_error_fails_over(self, mock_http):
+        hosts: list[str] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            hosts.append(request.url.host)
+            if request.url.host == "eu.example.com":
+                raise httpx.ConnectError("refused", request=request)
+            return httpx.Response(200, json={"items": []})
+
+        caller = APICaller()
+        mock_http(handler)
+        result = await caller.call(regional_tool("POST"), {})
+        assert result.body == {"items": []}
+        await caller.call(regional_tool("POST"), {})
+        assert hosts == ["eu.example.com", "us.example.com", "us.example.com"]
+        assert not caller.router.is_healthy(EU)
+
+    @pytest.mark.asyncio
+    async def test_server_error_fails_over_for_idempotent_method(self, mock_http):
+        def handler(request: httpx.Request) -> httpx.Response:
+            status = 503 if request.url.host == "eu.example.com" else 200
+            return httpx.Response(status, json={"host": request.url.host})
+
+        mock_http(handler)
+        result = await APICaller().call(regional_tool("GET"), {})
+        assert result.status_code == 200
+        assert result.body == {"host": "us.example.com"}
+
+    @pytest.mark.asyncio
+    async def test_server_error_not_retried_for_post(self, mock_http):
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(503, json={"host": request.url.host})
+
+        mock_http(handler)
+        result = await APICaller().call(regional_tool("POST"), {})
+        assert result.status_code == 503
+        assert result.body == {"host": "eu.example.com"}
+
+    @pytest.mark.asyncio
+    async def test_all_servers_down_raises(self, mock_http):
+        def handler(request: httpx.Request) -> httpx.Response:
+            raise httpx.ConnectError("refused", request=request)
+
+        mock_http(handler)
+        with pytest.raises(httpx.ConnectError):
+            await APICaller().call(regional_tool(), {})
+
+    @pytest.mark.asyncio
+    async def test_fastest_server_preferred(self, mock_http):
+        hosts: list[str] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            hosts.append(request.url.host)
+            return httpx.Response(200, json={})
+
+        caller = APICaller()
+        caller.router.record_success(EU, 0.300)
+        caller.router.record_success(US, 0.020)
+        mock_http(handler)
+        await caller.call(regional_tool(), {})
+        assert hosts == ["us.example.com"]
+
+    @pytest.mark.asyncio
+    async def test_file_object_rewound_before_failover(self, mock_http):
+        bodies: dict[str, bytes] = {}
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            bodies[request.url.host] = request.content
+            status = 503 if request.url.host == "eu.example.com" else 200
+            return httpx.Response(status, json={})
+
+        source = io.BytesIO(b"header|payload-data")
+        source.seek(len(b"header|"))
+        mock_http(handler)
+        result = await APICaller().call(regional_upload_tool(), {"body": source})
+        assert result.status_code == 200
+        assert bodies == {"eu.example.com": b"payload-data", "us.example.com": b"payload-data"}
+
+    @pytest.mark.asyncio
+    async def test_unseekable_stream_not_resent(self, mock_http):
+        hosts: list[str] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            hosts.append(request.url.host)
+            return httpx.Response(503, json={})
+
+        source = UnseekableStream(b"payload-data")
+        mock_http(handler)
+        result = await APICaller().call(regional_upload_tool(), {"body": source})
+        assert result.status_code == 503
+        assert hosts == ["eu.example.com"]